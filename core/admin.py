@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import Task, PomodoroSession
+from .models import Task, PomodoroSession, DailyQuote, BreathingExercise
 
 admin.site.register(Task)
 admin.site.register(PomodoroSession)
+admin.site.register(DailyQuote)
+admin.site.register(BreathingExercise)
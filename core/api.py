@@ -0,0 +1,281 @@
+"""Versioned JSON API (``/api/v1/``) for mobile and single-page clients.
+
+Authentication is the regular Django session; unsafe requests need the CSRF
+token in an ``X-CSRFToken`` header. Every response carries an ETag built
+from the user's change version (see ``core.snapshots``), so a client that
+sends ``If-None-Match`` gets a 304 before any query runs when nothing of
+theirs has changed.
+"""
+import hashlib
+import json
+from functools import wraps
+
+from django.db import IntegrityError
+from django.forms.models import model_to_dict
+from django.http import HttpResponse, JsonResponse
+from django.utils import timezone
+from django.views.decorators.http import etag, require_http_methods
+
+from core.catalog import daily_breathing_exercise, daily_quote
+from core.insights import PERIODS, compute_insights
+from core.forms import ApiTaskForm, CategoryForm, MoodEntryForm, PomodoroSessionForm, RewardForm
+from core.models import Category, MoodEntry, PomodoroSession, Rewards, Task
+from core.pagination import keyset_page
+from core.points import complete_task
+from core.pomodoro import finish_session
+from core.search import MAX_RESULTS, SearchUnavailable, search as search_entries
+from core.snapshots import get_dashboard_snapshot, get_user_version
+from core.streaks import record_activity
+
+
+API_VERSION = 1
+PAGE_SIZE = 100
+
+
+class Resource:
+    def __init__(self, model, form_class, fields, ordering='id', user_form_kwarg=False):
+        self.model = model
+        self.form_class = form_class
+        self.fields = fields
+        self.ordering = ordering
+        self.user_form_kwarg = user_form_kwarg
+
+    def queryset(self, user):
+        return self.model.objects.filter(user=user)
+
+    def form(self, user, data, instance):
+        kwargs = {'instance': instance}
+        if self.user_form_kwarg:
+            kwargs['user'] = user
+        return self.form_class(data, **kwargs)
+
+    def serialize(self, obj):
+        return {field: getattr(obj, field) for field in self.fields}
+
+
+RESOURCES = {
+    'tasks': Resource(Task, ApiTaskForm, [
+        'id', 'title', 'description', 'category_id', 'priority', 'status', 'points',
+        'due_date', 'created_at', 'completed_at', 'estimated_completed_at', 'actual_completed_at',
+    ], user_form_kwarg=True),
+    'categories': Resource(Category, CategoryForm, [
+        'id', 'name', 'color', 'is_default', 'is_active', 'todo_count', 'in_progress_count', 'completed_count',
+    ]),
+    'pomodoro-sessions': Resource(PomodoroSession, PomodoroSessionForm, [
+        'id', 'task_id', 'start_time', 'end_time', 'duration', 'planned_duration', 'completed', 'notes',
+    ], user_form_kwarg=True),
+    'mood-entries': Resource(MoodEntry, MoodEntryForm, [
+        'id', 'date', 'time', 'mood', 'water_intake', 'exercised', 'diet_summary', 'notes',
+    ]),
+    'rewards': Resource(Rewards, RewardForm, [
+        'id', 'title', 'description', 'points', 'is_claimed', 'claimed_at', 'is_active', 'created_at',
+    ]),
+}
+
+
+# Search result type -> the resource that serializes it.
+SEARCH_RESOURCES = {'task': 'tasks', 'journal': 'mood-entries'}
+
+
+def api_login_required(view):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return JsonResponse({'error': 'Authentication required'}, status=401)
+        return view(request, *args, **kwargs)
+    return wrapper
+
+
+def _etag(request, *extra):
+    user = request.user
+    parts = [f'v{API_VERSION}', str(user.pk), str(get_user_version(user.pk)), request.get_full_path(), *extra]
+    return 'W/"%s"' % hashlib.md5(':'.join(parts).encode()).hexdigest()
+
+
+def user_etag(request, *args, **kwargs):
+    """Weak ETag from the user's change version and the request path; costs
+    one cache lookup and no queries."""
+    return _etag(request)
+
+
+def dashboard_etag(request):
+    # Points and streak live on the already-loaded user row, and the
+    # snapshot rolls over at midnight.
+    user = request.user
+    return _etag(request, timezone.localdate().isoformat(), str(user.points), str(user.current_streak))
+
+
+def insights_etag(request):
+    # The period ends today, so the ETag rolls over at midnight too.
+    return _etag(request, timezone.localdate().isoformat())
+
+
+def _parse_body(request):
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _resource_or_404(name):
+    resource = RESOURCES.get(name)
+    if resource is None:
+        return None, JsonResponse({'error': 'Unknown resource'}, status=404)
+    return resource, None
+
+
+def _save(request, resource, instance, data):
+    # Read before validation, which copies the submitted data onto instance.
+    previous_status = instance.status if resource.model is Task and instance.pk else None
+    previously_completed = resource.model is PomodoroSession and instance.pk and instance.completed
+    creating = instance.pk is None
+    form = resource.form(request.user, data, instance)
+    if not form.is_valid():
+        return None, JsonResponse({'errors': form.errors.get_json_data()}, status=400)
+    obj = form.save(commit=False)
+    obj.user = request.user
+    # Completing a task goes through complete_task, which credits the
+    # points, writes the ledger row and records the activity exactly once.
+    completing = resource.model is Task and obj.status == 'completed' and previous_status != 'completed'
+    if completing:
+        obj.status = previous_status or 'todo'
+    # Likewise a session is completed by finish_session, which also updates
+    # the user and task totals and the streak.
+    finishing = resource.model is PomodoroSession and obj.completed and not previously_completed
+    if finishing:
+        end_time, obj.completed, obj.end_time = obj.end_time, False, None
+    try:
+        obj.save()
+    except IntegrityError:
+        return None, JsonResponse({'error': 'This object conflicts with an existing one.'}, status=409)
+    if completing:
+        complete_task(obj)
+        obj.refresh_from_db()
+    if finishing:
+        finish_session(obj, now=end_time)
+        obj.refresh_from_db()
+    if creating and resource.model is MoodEntry:
+        # A journal entry counts towards the streak, as in journal_view.
+        record_activity(request.user.pk, obj.date)
+    return obj, None
+
+
+@api_login_required
+@require_http_methods(['GET', 'POST'])
+@etag(user_etag)
+def collection(request, resource_name):
+    resource, error = _resource_or_404(resource_name)
+    if error:
+        return error
+
+    if request.method == 'POST':
+        data = _parse_body(request)
+        if data is None:
+            return JsonResponse({'error': 'Expected a JSON object'}, status=400)
+        obj, error = _save(request, resource, resource.model(user=request.user), data)
+        return error or JsonResponse(resource.serialize(obj), status=201)
+
+    page = keyset_page(resource.queryset(request.user), [resource.ordering], request.GET.get('cursor'), PAGE_SIZE)
+    return JsonResponse({
+        'results': [resource.serialize(obj) for obj in page.items],
+        'next_cursor': page.next_cursor,
+    })
+
+
+@api_login_required
+@require_http_methods(['GET', 'PATCH', 'DELETE'])
+@etag(user_etag)
+def detail(request, resource_name, pk):
+    resource, error = _resource_or_404(resource_name)
+    if error:
+        return error
+    obj = resource.queryset(request.user).filter(pk=pk).first()
+    if obj is None:
+        return JsonResponse({'error': 'Not found'}, status=404)
+
+    if request.method == 'DELETE':
+        obj.delete()
+        return HttpResponse(status=204)
+
+    if request.method == 'PATCH':
+        data = _parse_body(request)
+        if data is None:
+            return JsonResponse({'error': 'Expected a JSON object'}, status=400)
+        current = model_to_dict(obj, fields=resource.form_class._meta.fields)
+        obj, error = _save(request, resource, obj, {**current, **data})
+        if error:
+            return error
+
+    return JsonResponse(resource.serialize(obj))
+
+
+@api_login_required
+@require_http_methods(['GET'])
+@etag(dashboard_etag)
+def dashboard(request):
+    user = request.user
+    today = timezone.localdate()
+    snapshot = get_dashboard_snapshot(user, today)
+    quote = daily_quote(user.pk, today)
+    exercise = daily_breathing_exercise(user.pk, today)
+    mood_entry = snapshot['mood_entry']
+    return JsonResponse({
+        'date': today,
+        'today_tasks': [RESOURCES['tasks'].serialize(task) for task in snapshot['today_tasks']],
+        'today_tasks_count': snapshot['today_tasks_count'],
+        'completed_today_count': snapshot['completed_today_count'],
+        'pending_tasks_count': snapshot['pending_tasks_count'],
+        'pomodoro_sessions': snapshot['pomodoro_today'],
+        'total_points': user.points,
+        'streak_days': user.current_streak,
+        'mood_entry': RESOURCES['mood-entries'].serialize(mood_entry) if mood_entry else None,
+        'quote': {'quote': quote.quote, 'author': quote.author} if quote else None,
+        'breathing_exercise': {
+            'title': exercise.title,
+            'inhale_duration': exercise.inhale_duration,
+            'hold_duration': exercise.hold_duration,
+            'exhale_duration': exercise.exhale_duration,
+            'cycles': exercise.cycles,
+        } if exercise else None,
+    })
+
+
+@api_login_required
+@require_http_methods(['GET'])
+@etag(insights_etag)
+def insights(request):
+    try:
+        days = int(request.GET.get('days', PERIODS[0]))
+    except ValueError:
+        days = None
+    if days not in PERIODS:
+        return JsonResponse({'error': f'days must be one of {", ".join(map(str, PERIODS))}'}, status=400)
+    data = compute_insights(request.user.pk, timezone.localdate(), days)
+    return JsonResponse(data, json_dumps_params={'separators': (',', ':')})
+
+
+@api_login_required
+@require_http_methods(['GET'])
+@etag(user_etag)
+def search(request):
+    query = request.GET.get('q', '').strip()
+    if not query:
+        return JsonResponse({'error': 'q is required'}, status=400)
+    try:
+        hits = search_entries(request.user.pk, query, MAX_RESULTS)
+    except SearchUnavailable as e:
+        return JsonResponse({'error': str(e)}, status=501)
+    return JsonResponse({
+        'query': query,
+        'results': [
+            {
+                'type': kind,
+                'rank': rank,
+                'title_highlight': title,
+                'snippet': snippet,
+                'object': RESOURCES[SEARCH_RESOURCES[kind]].serialize(obj),
+            }
+            for kind, obj, rank, title, snippet in hits
+        ],
+    })
@@ -0,0 +1,136 @@
+"""Static asset pipeline.
+
+``collectstatic`` writes ``.gz`` and ``.br`` siblings of the compressible
+files and, with ``STATIC_MANIFEST`` on, content-hashed copies of every file
+(via ``ManifestStaticFilesStorage``). ``serve_asset`` serves them straight from
+``STATIC_ROOT``, picking the precompressed variant the client accepts and
+marking hashed files as immutable, so repeat visits fetch no asset bytes.
+"""
+import gzip
+import mimetypes
+import posixpath
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, StaticFilesStorage, staticfiles_storage
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.base import ContentFile
+from django.http import FileResponse, Http404, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+from django.views.static import was_modified_since
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; clients then get gzip.
+    brotli = None
+
+
+COMPRESSIBLE_EXTENSIONS = {'.css', '.js', '.map', '.svg', '.json', '.txt', '.html', '.xml', '.wav'}
+MIN_COMPRESS_SIZE = 256
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'public, max-age=0, must-revalidate'
+
+
+def compressed_variants(data):
+    """Yield ``(suffix, compressed)`` for each encoding that saves space."""
+    encoders = [('.gz', lambda raw: gzip.compress(raw, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        encoders.insert(0, ('.br', lambda raw: brotli.compress(raw, quality=11)))
+    for suffix, encode in encoders:
+        compressed = encode(data)
+        if len(compressed) < len(data) * 0.95:
+            yield suffix, compressed
+
+
+class CompressionMixin:
+    """Write ``.br``/``.gz`` siblings of the collected files."""
+
+    def post_process(self, paths, dry_run=False, **options):
+        parent = getattr(super(), 'post_process', None)
+        if parent is not None:
+            yield from parent(paths, dry_run, **options)
+        if dry_run:
+            return
+        hashed_files = getattr(self, 'hashed_files', {})
+        for name in sorted(set(paths) | set(hashed_files.values())):
+            if posixpath.splitext(name)[1] in COMPRESSIBLE_EXTENSIONS and self.exists(name):
+                self.compress(name)
+
+    def compress(self, name):
+        with self.open(name) as f:
+            data = f.read()
+        if len(data) < MIN_COMPRESS_SIZE:
+            return
+        for suffix, compressed in compressed_variants(data):
+            if self.exists(name + suffix):
+                self.delete(name + suffix)
+            self._save(name + suffix, ContentFile(compressed))
+
+
+class CompressedStaticFilesStorage(CompressionMixin, StaticFilesStorage):
+    pass
+
+
+class CompressedManifestStaticFilesStorage(CompressionMixin, ManifestStaticFilesStorage):
+    pass
+
+
+@lru_cache(maxsize=4)
+def _hashed_names(manifest_hash):
+    return frozenset(getattr(staticfiles_storage, 'hashed_files', {}).values())
+
+
+def is_immutable(path):
+    """True for content-hashed names, which never change once written."""
+    return path in _hashed_names(getattr(staticfiles_storage, 'manifest_hash', ''))
+
+
+def _accepted_encodings(request):
+    accepted = set()
+    for item in request.headers.get('Accept-Encoding', '').split(','):
+        coding, *params = [part.strip() for part in item.split(';')]
+        quality = next((param[2:] for param in params if param.startswith('q=')), '1')
+        try:
+            if float(quality) > 0:
+                accepted.add(coding.lower())
+        except ValueError:
+            pass
+    return accepted
+
+
+@require_safe
+def serve_asset(request, path):
+    path = posixpath.normpath(path).lstrip('/')
+    try:
+        fullpath = Path(safe_join(settings.STATIC_ROOT, path))
+    except SuspiciousFileOperation:
+        raise Http404('Invalid path')
+    if not fullpath.is_file():
+        raise Http404(f'"{path}" does not exist')
+
+    stat = fullpath.stat()
+    immutable = is_immutable(path)
+    if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), stat.st_mtime):
+        return HttpResponseNotModified()
+
+    variants = [
+        (fullpath.with_name(fullpath.name + suffix), coding)
+        for suffix, coding in (('.br', 'br'), ('.gz', 'gzip'))
+    ]
+    variants = [(variant, coding) for variant, coding in variants if variant.is_file()]
+    accepted = _accepted_encodings(request)
+    served, encoding = next(((variant, coding) for variant, coding in variants if coding in accepted), (fullpath, None))
+
+    content_type, _ = mimetypes.guess_type(fullpath.name)
+    response = FileResponse(served.open('rb'), content_type=content_type or 'application/octet-stream')
+    response.headers['Last-Modified'] = http_date(stat.st_mtime)
+    response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    if variants:
+        patch_vary_headers(response, ['Accept-Encoding'])
+    return response
@@ -0,0 +1,45 @@
+from functools import partial
+
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.db import transaction
+
+
+USER_CACHE_SCHEMA = 1
+USER_CACHE_TIMEOUT = 15 * 60
+
+
+def user_cache_key(user_id):
+    return f'auth-user:{USER_CACHE_SCHEMA}:{user_id}'
+
+
+def invalidate_cached_users(*user_ids):
+    """Drop cached users once the current transaction commits, so no
+    request can re-cache the old row in between. Call it after any
+    ``User`` change that bypasses ``save()`` (queryset ``update()``,
+    ``bulk_update()``)."""
+    keys = [user_cache_key(user_id) for user_id in user_ids]
+    if keys:
+        transaction.on_commit(partial(cache.delete_many, keys))
+
+
+class CachedModelBackend(ModelBackend):
+    """``ModelBackend`` that keeps the authenticated user in the cache, so
+    a request does not need to read the user row before the view runs.
+    ``User.save()`` and ``invalidate_cached_users`` evict the entry."""
+
+    def get_user(self, user_id):
+        user = cache.get(user_cache_key(user_id))
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(user_cache_key(user_id), user, USER_CACHE_TIMEOUT)
+        return user if user is not None and self.user_can_authenticate(user) else None
+
+    async def aget_user(self, user_id):
+        user = await cache.aget(user_cache_key(user_id))
+        if user is None:
+            user = await super().aget_user(user_id)
+            if user is not None:
+                await cache.aset(user_cache_key(user_id), user, USER_CACHE_TIMEOUT)
+        return user if user is not None and self.user_can_authenticate(user) else None
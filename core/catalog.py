@@ -0,0 +1,58 @@
+import hashlib
+import threading
+import time
+
+from django.core.cache import cache
+
+from core.models import BreathingExercise, DailyQuote
+
+
+GENERATION_KEY = 'content-catalog:generation'
+
+_lock = threading.Lock()
+_catalog = {'generation': None, 'quotes': (), 'exercises': ()}
+
+
+def _current_generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        generation = time.time_ns()
+        cache.add(GENERATION_KEY, generation, None)
+    return generation
+
+
+def invalidate_catalog():
+    """Make every process reload the catalog on its next pick."""
+    # set() with no expiry rather than incr(), which on some backends
+    # rewrites the key with the default timeout.
+    cache.set(GENERATION_KEY, time.time_ns(), None)
+
+
+def _load(generation):
+    _catalog['quotes'] = tuple(DailyQuote.objects.filter(is_active=True).order_by('pk'))
+    _catalog['exercises'] = tuple(BreathingExercise.objects.filter(is_active=True).order_by('pk'))
+    _catalog['generation'] = generation
+
+
+def get_catalog():
+    generation = _current_generation()
+    if _catalog['generation'] != generation:
+        with _lock:
+            if _catalog['generation'] != generation:
+                _load(generation)
+    return _catalog
+
+
+def _pick(items, user_id, day, salt):
+    if not items:
+        return None
+    digest = hashlib.blake2b(f'{salt}:{user_id}:{day.isoformat()}'.encode(), digest_size=8).digest()
+    return items[int.from_bytes(digest, 'big') % len(items)]
+
+
+def daily_quote(user_id, day):
+    return _pick(get_catalog()['quotes'], user_id, day, 'quote')
+
+
+def daily_breathing_exercise(user_id, day):
+    return _pick(get_catalog()['exercises'], user_id, day, 'breathing')
@@ -0,0 +1,64 @@
+from django.conf import settings
+from django.db.models import Count, F, Q
+from django.db.models.functions import Greatest
+
+from core.models import Category, Task
+
+
+COUNTER_FIELDS = {
+    'todo': 'todo_count',
+    'in_progress': 'in_progress_count',
+    'completed': 'completed_count',
+}
+
+
+def counters_enabled():
+    return getattr(settings, 'CATEGORY_TASK_COUNTERS', False)
+
+
+def with_status_counts(queryset):
+    """Annotate categories with live per-status task counts, unless the
+    denormalized counters are enabled and can be read directly."""
+    if counters_enabled():
+        return queryset
+    return queryset.annotate(**{
+        f'{status}_tasks': Count('tasks', filter=Q(tasks__status=status))
+        for status in COUNTER_FIELDS
+    })
+
+
+def status_counts(category):
+    if counters_enabled():
+        return {status: getattr(category, field) for status, field in COUNTER_FIELDS.items()}
+    return {status: getattr(category, f'{status}_tasks') for status in COUNTER_FIELDS}
+
+
+def adjust(category_id, status, delta):
+    field = COUNTER_FIELDS.get(status)
+    if category_id is None or field is None:
+        return
+    Category.objects.filter(pk=category_id).update(**{field: Greatest(F(field) + delta, 0)})
+
+
+def adjust_many(deltas):
+    """Apply ``{(category_id, status): delta}`` in one UPDATE per entry."""
+    for (category_id, status), delta in deltas.items():
+        if delta:
+            adjust(category_id, status, delta)
+
+
+def rebuild(categories=None):
+    categories = Category.objects.all() if categories is None else categories
+    totals = {}
+    rows = (Task.objects.filter(category__in=categories)
+            .values('category', 'status').annotate(total=Count('pk')).order_by())
+    for row in rows:
+        totals[(row['category'], row['status'])] = row['total']
+
+    batch = []
+    for category in categories.only('pk').iterator(chunk_size=2000):
+        for status, field in COUNTER_FIELDS.items():
+            setattr(category, field, totals.get((category.pk, status), 0))
+        batch.append(category)
+    Category.objects.bulk_update(batch, list(COUNTER_FIELDS.values()), batch_size=1000)
+    return len(batch)
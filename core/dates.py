@@ -0,0 +1,12 @@
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+
+
+def day_range(day):
+    """Return the aware ``[start, end)`` datetimes of ``day`` in the current
+    time zone, so date filters stay index-friendly range scans instead of
+    wrapping the column in a date cast."""
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    end = timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min))
+    return start, end
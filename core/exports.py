@@ -0,0 +1,125 @@
+import csv
+import zlib
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+
+from core.models import AISummary, MoodEntry, PomodoroSession, Rewards, Task
+
+
+CHUNK_SIZE = 2000
+FLUSH_BYTES = 64 * 1024
+
+DATASETS = {
+    'tasks': (Task, [
+        'id', 'title', 'description', 'category__name', 'priority', 'status', 'points',
+        'due_date', 'created_at', 'completed_at', 'estimated_completed_at', 'actual_completed_at',
+    ]),
+    'pomodoro_sessions': (PomodoroSession, [
+        'id', 'task_id', 'start_time', 'end_time', 'duration', 'planned_duration', 'completed', 'notes',
+    ]),
+    'mood_entries': (MoodEntry, [
+        'id', 'date', 'time', 'mood', 'water_intake', 'exercised', 'diet_summary', 'notes',
+    ]),
+    'rewards': (Rewards, [
+        'id', 'title', 'description', 'points', 'is_claimed', 'claimed_at', 'is_active', 'created_at',
+    ]),
+    'ai_summaries': (AISummary, [
+        'id', 'date', 'content', 'created_at',
+    ]),
+}
+FORMATS = ('csv', 'ndjson')
+
+
+def _rows(user, dataset):
+    model, fields = DATASETS[dataset]
+    queryset = model.objects.filter(user=user).order_by('pk').values_list(*fields)
+    headers = [field.split('__')[0] for field in fields]
+    return headers, queryset.iterator(chunk_size=CHUNK_SIZE)
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def _csv_lines(user, dataset):
+    fields, rows = _rows(user, dataset)
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def _ndjson_lines(user, datasets):
+    encoder = DjangoJSONEncoder()
+    for dataset in datasets:
+        fields, rows = _rows(user, dataset)
+        for row in rows:
+            yield encoder.encode({'dataset': dataset, **dict(zip(fields, row))}) + '\n'
+
+
+def _buffered(lines):
+    """Join small lines into chunks of roughly ``FLUSH_BYTES``."""
+    buffer, size = [], 0
+    for line in lines:
+        data = line.encode()
+        buffer.append(data)
+        size += len(data)
+        if size >= FLUSH_BYTES:
+            yield b''.join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+def _gzipped(chunks):
+    compressor = zlib.compressobj(wbits=31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_stream(user, dataset, fmt='ndjson', gzip=False):
+    """Yield the export as byte chunks without holding it in memory.
+
+    ``dataset`` is a key of ``DATASETS`` or ``'all'``; exporting everything
+    at once is only possible as NDJSON, where every line names its dataset.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f'Unknown export format: {fmt}')
+    if dataset == 'all':
+        if fmt == 'csv':
+            raise ValueError('CSV exports cover one dataset at a time.')
+        datasets = list(DATASETS)
+    elif dataset in DATASETS:
+        datasets = [dataset]
+    else:
+        raise ValueError(f'Unknown dataset: {dataset}')
+
+    lines = _csv_lines(user, dataset) if fmt == 'csv' else _ndjson_lines(user, datasets)
+    chunks = _buffered(lines)
+    return _gzipped(chunks) if gzip else chunks
+
+
+async def _aiterate(chunks):
+    # Each chunk is produced on the request's worker thread, where the
+    # queryset cursors live; only one chunk is in memory at a time.
+    done = object()
+    try:
+        while (chunk := await sync_to_async(next)(chunks, done)) is not done:
+            yield chunk
+    finally:
+        await sync_to_async(chunks.close)()
+
+
+def aexport_stream(user, dataset, fmt='ndjson', gzip=False):
+    """:func:`export_stream` as an async iterator, for ASGI. Django reads a
+    sync iterator whole into memory before sending it under ASGI."""
+    return _aiterate(export_stream(user, dataset, fmt, gzip))
+
+
+def export_filename(user, dataset, fmt, gzip=False):
+    return f'neurozen-{user.username}-{dataset}.{fmt}' + ('.gz' if gzip else '')
@@ -1,10 +1,12 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth import get_user_model
-from core.models import Category, Task, MoodEntry, Rewards
+from core.models import Category, Task, MoodEntry, Rewards, PomodoroSession
 
 User = get_user_model()
 
+ISO_DATETIME_FORMATS = ['%Y-%m-%dT%H:%M', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d']
+
 class UserRegisterForm(UserCreationForm):
     email = forms.EmailField(required=True)
 
@@ -32,6 +34,58 @@ class   TaskForm(forms.ModelForm):
             self.fields['category'].queryset = Category.objects.filter(user=user, is_active=True)
 
 
+class TaskImportRowForm(TaskForm):
+    """Validates one imported row with the TaskForm rules. The category is
+    looked up by name in a map prefetched once per import instead of through
+    a per-row ModelChoiceField query."""
+
+    due_date = forms.DateTimeField(required=False, input_formats=ISO_DATETIME_FORMATS)
+    category = forms.CharField()
+
+    class Meta(TaskForm.Meta):
+        fields = [name for name in TaskForm.Meta.fields if name != 'category']
+
+    def __init__(self, *args, categories, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.categories = categories
+
+    def clean_category(self):
+        name = self.cleaned_data['category'].strip().lower().replace(' ', '_')
+        category = self.categories.get(name)
+        if category is None:
+            raise forms.ValidationError(f'Unknown category "{self.cleaned_data["category"]}".')
+        return category
+
+
+class ApiTaskForm(TaskForm):
+    due_date = forms.DateTimeField(required=False, input_formats=ISO_DATETIME_FORMATS)
+
+
+class CategoryForm(forms.ModelForm):
+    class Meta:
+        model = Category
+        fields = ['name', 'color', 'is_active']
+
+
+class PomodoroSessionForm(forms.ModelForm):
+    start_time = forms.DateTimeField(input_formats=ISO_DATETIME_FORMATS)
+    end_time = forms.DateTimeField(required=False, input_formats=ISO_DATETIME_FORMATS)
+
+    class Meta:
+        model = PomodoroSession
+        fields = ['task', 'start_time', 'end_time', 'duration', 'completed', 'notes']
+
+    def __init__(self, *args, **kwargs):
+        user = kwargs.pop('user', None)
+        super().__init__(*args, **kwargs)
+        if user is not None:
+            self.fields['task'].queryset = Task.objects.filter(user=user)
+
+
+class TaskImportForm(forms.Form):
+    file = forms.FileField(help_text='CSV with a header row, or a JSON list of objects.')
+
+
 class MoodEntryForm(forms.ModelForm):
     class Meta:
         model = MoodEntry
@@ -0,0 +1,133 @@
+import csv
+import io
+import json
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core import counters, rollups
+from core.backends import invalidate_cached_users
+from core.forms import TaskImportRowForm
+from core.models import Category, PointsTransaction, Task, User
+from core.snapshots import bump_user_version
+from core.streaks import record_activity
+
+
+MAX_ROWS = 50000
+BATCH_SIZE = 1000
+ROW_DEFAULTS = {'status': 'todo', 'priority': 'medium', 'points': 10}
+
+
+class ImportFileError(Exception):
+    def __init__(self, message, created=0):
+        super().__init__(message)
+        self.created = created
+
+
+def read_rows(upload):
+    """Yield dict rows from an uploaded CSV or JSON file."""
+    name = (upload.name or '').lower()
+    if name.endswith('.json'):
+        try:
+            rows = json.load(upload)
+        except (ValueError, UnicodeDecodeError) as e:
+            raise ImportFileError(f'Invalid JSON: {e}')
+        if not isinstance(rows, list):
+            raise ImportFileError('The JSON file must contain a list of task objects.')
+        yield from rows
+    else:
+        try:
+            yield from csv.DictReader(io.TextIOWrapper(upload, encoding='utf-8-sig'))
+        except (csv.Error, UnicodeDecodeError) as e:
+            raise ImportFileError(f'Invalid CSV: {e}')
+
+
+def _category_map(user):
+    categories = {}
+    for category in Category.objects.filter(user=user, is_active=True):
+        categories[category.name] = category
+        categories[category.get_name_display().lower().replace(' ', '_')] = category
+    return categories
+
+
+def _insert(user, tasks):
+    completed = [task for task in tasks if task.status == 'completed']
+    with transaction.atomic():
+        Task.objects.bulk_create(tasks, batch_size=BATCH_SIZE)
+        counters.adjust_many(Counter((task.category_id, task.status) for task in tasks))
+        rollups.add_contributions(
+            rollups.task_contribution(task.user_id, task.due_date, task.status, task.completed_at, task.points)
+            for task in tasks
+        )
+        # Credit completed tasks like complete_task does, so the balance,
+        # the ledger, DailyStats.points_earned and the streak agree.
+        if completed:
+            PointsTransaction.objects.bulk_create([
+                PointsTransaction(user=user, amount=task.points, kind=PointsTransaction.KIND_TASK,
+                                  task=task, created_at=task.completed_at)
+                for task in completed if task.points
+            ], batch_size=BATCH_SIZE)
+            User.objects.filter(pk=user.pk).update(
+                points=F('points') + sum(task.points for task in completed),
+                total_completed_tasks=F('total_completed_tasks') + len(completed),
+            )
+            invalidate_cached_users(user.pk)
+            for day in sorted({timezone.localdate(task.completed_at) for task in completed}):
+                record_activity(user.pk, day)
+
+
+def import_tasks(user, rows):
+    """Validate and insert task ``rows`` for ``user`` in batches.
+
+    Invalid rows are skipped and reported; valid rows are inserted either
+    way. Completed tasks count as completed through the app: their points
+    are credited (with ledger rows) and the day counts towards the streak. Returns ``(created, errors)`` where ``errors`` is a list of
+    ``(row_number, {field: [messages]})``. If the file turns out to be
+    malformed part-way, the rows before the error are still imported and
+    the raised ``ImportFileError`` carries their count in ``created``.
+    """
+    categories = _category_map(user)
+    created, errors, batch = 0, [], []
+
+    try:
+        for number, row in enumerate(rows, start=1):
+            if number > MAX_ROWS:
+                errors.append((number, {'__all__': [f'Imports are limited to {MAX_ROWS} rows.']}))
+                break
+            if not isinstance(row, dict):
+                errors.append((number, {'__all__': ['Each row must be an object.']}))
+                continue
+
+            data = {**ROW_DEFAULTS, **{key: value for key, value in row.items() if value not in (None, '')}}
+            form = TaskImportRowForm(data, categories=categories)
+            if not form.is_valid():
+                errors.append((number, {field: list(messages) for field, messages in form.errors.items()}))
+                continue
+
+            task = form.save(commit=False)
+            task.user = user
+            task.category = form.cleaned_data['category']
+            if task.status == 'completed' and not task.completed_at:
+                task.completed_at = timezone.now()
+            batch.append(task)
+            if len(batch) >= BATCH_SIZE:
+                _insert(user, batch)
+                created += len(batch)
+                batch = []
+        file_error = None
+    except ImportFileError as e:
+        # The rows are parsed lazily, so earlier batches may already be
+        # committed: keep them (and the rows read so far), and report how
+        # many were imported along with the error.
+        file_error = e
+
+    if batch:
+        _insert(user, batch)
+        created += len(batch)
+    if created:
+        bump_user_version(user.pk)
+    if file_error is not None:
+        raise ImportFileError(str(file_error), created=created) from file_error
+    return created, errors
@@ -0,0 +1,136 @@
+"""Trends over the ``DailyStats`` rollups, computed with NumPy.
+
+One range query fetches the period as columns; every series is then a
+vectorized pass over dense per-day arrays, and the result is returned in
+columnar form (one list per series, aligned on the period's days).
+"""
+from datetime import timedelta
+
+import numpy as np
+
+from core.models import DailyStats
+
+
+PERIODS = (30, 90, 365)
+ROLLING_WINDOW = 7
+MOOD_SCORES = {'very_sad': 1, 'sad': 2, 'neutral': 3, 'happy': 4, 'very_happy': 5}
+CORRELATED = ('exercised', 'water_intake', 'pomodoros', 'mood')
+MIN_CORRELATION_DAYS = 5
+
+
+def load_columns(user_id, start, end):
+    """Dense per-day arrays of the inclusive ``[start, end]`` range. Days
+    without a rollup row count as zero activity and unknown mood."""
+    days = (end - start).days + 1
+    columns = {
+        'tasks_due': np.zeros(days),
+        'tasks_completed': np.zeros(days),
+        'pomodoros': np.zeros(days),
+        'focus_minutes': np.zeros(days),
+        'mood': np.full(days, np.nan),
+        'water_intake': np.full(days, np.nan),
+        'exercised': np.full(days, np.nan),
+    }
+    rows = list(DailyStats.objects.filter(user_id=user_id, date__gte=start, date__lte=end)
+                .values_list('date', 'tasks_due', 'tasks_completed', 'pomodoros', 'focus_minutes',
+                             'mood', 'water_intake', 'exercised'))
+    if not rows:
+        return columns
+
+    dates, due, completed, pomodoros, focus, moods, water, exercised = zip(*rows)
+    index = np.array([(day - start).days for day in dates])
+    columns['tasks_due'][index] = due
+    columns['tasks_completed'][index] = completed
+    columns['pomodoros'][index] = pomodoros
+    columns['focus_minutes'][index] = focus
+    columns['mood'][index] = [MOOD_SCORES.get(mood, np.nan) for mood in moods]
+    columns['water_intake'][index] = [np.nan if value is None else value for value in water]
+    columns['exercised'][index] = [np.nan if value is None else value for value in exercised]
+    return columns
+
+
+def _rolling_sum(values, window):
+    sums = np.cumsum(values)
+    sums[window:] = sums[window:] - sums[:-window]
+    return sums
+
+
+def rolling_mean(values, window=ROLLING_WINDOW):
+    """Trailing mean that skips unknown (NaN) days; NaN where the whole
+    window is unknown."""
+    known = ~np.isnan(values)
+    totals = _rolling_sum(np.where(known, values, 0.0), window)
+    counts = _rolling_sum(known.astype(float), window)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(counts > 0, totals / counts, np.nan)
+
+
+def rolling_ratio(numerator, denominator, window=ROLLING_WINDOW):
+    top = _rolling_sum(numerator, window)
+    bottom = _rolling_sum(denominator, window)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(bottom > 0, top / bottom, np.nan)
+
+
+def streak_lengths(active):
+    """Length of the run of consecutive active days ending on each day."""
+    index = np.arange(len(active))
+    last_idle = np.maximum.accumulate(np.where(active, -1, index))
+    return np.where(active, index - last_idle, 0)
+
+
+def correlations(columns, names=CORRELATED):
+    """Pairwise Pearson correlations over the days where both values are
+    known; ``None`` where there are too few days or no variance."""
+    matrix = []
+    for a in names:
+        row = []
+        for b in names:
+            x, y = columns[a], columns[b]
+            known = ~(np.isnan(x) | np.isnan(y))
+            x, y = x[known], y[known]
+            if known.sum() < MIN_CORRELATION_DAYS or x.std() == 0 or y.std() == 0:
+                row.append(None)
+            else:
+                row.append(round(float(np.corrcoef(x, y)[0, 1]), 3))
+        matrix.append(row)
+    return {'fields': list(names), 'matrix': matrix}
+
+
+def _series(values, digits=2):
+    rounded = np.round(values, digits).tolist()
+    return [None if value != value else value for value in rounded]
+
+
+def compute_insights(user_id, today, days):
+    start = today - timedelta(days=days - 1)
+    columns = load_columns(user_id, start, today)
+    active = (columns['pomodoros'] > 0) | (columns['tasks_completed'] > 0) | ~np.isnan(columns['mood'])
+    streak = streak_lengths(active)
+    due, completed = columns['tasks_due'].sum(), columns['tasks_completed'].sum()
+    moods = columns['mood'][~np.isnan(columns['mood'])]
+
+    return {
+        'start': start,
+        'end': today,
+        'days': days,
+        'window': ROLLING_WINDOW,
+        'series': {
+            'focus_minutes': columns['focus_minutes'].astype(int).tolist(),
+            'pomodoros': columns['pomodoros'].astype(int).tolist(),
+            'completion_rate': _series(rolling_ratio(columns['tasks_completed'], columns['tasks_due'])),
+            'mood': _series(rolling_mean(columns['mood'])),
+            'streak': streak.tolist(),
+        },
+        'correlations': correlations(columns),
+        'totals': {
+            'focus_minutes': int(columns['focus_minutes'].sum()),
+            'pomodoros': int(columns['pomodoros'].sum()),
+            'tasks_due': int(due),
+            'tasks_completed': int(completed),
+            'completion_rate': round(float(completed / due), 3) if due else None,
+            'average_mood': round(float(moods.mean()), 2) if moods.size else None,
+            'active_days': int(active.sum()),
+            'longest_streak': int(streak.max(initial=0)),
+        },
+    }
@@ -0,0 +1,216 @@
+import asyncio
+import hashlib
+import json
+import weakref
+from contextlib import contextmanager
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+
+from core.throttling import CircuitBreaker
+
+
+class LLMError(Exception):
+    pass
+
+
+class CircuitOpenError(LLMError):
+    pass
+
+
+class BaseLLMClient:
+    def complete(self, messages):
+        """Return the assistant reply for a list of chat ``messages``."""
+        raise NotImplementedError
+
+    async def acomplete(self, messages):
+        """Async version of :meth:`complete`. Clients without a native async
+        transport run the blocking call on a worker thread."""
+        return await asyncio.to_thread(self.complete, messages)
+
+    def stream(self, messages):
+        """Yield the reply in chunks as it is generated. Clients that can't
+        stream yield it in one piece."""
+        yield self.complete(messages)
+
+    async def astream(self, messages):
+        """Async version of :meth:`stream`."""
+        yield await self.acomplete(messages)
+
+    async def aclose(self):
+        """Release the connections opened on the running event loop."""
+
+    def cache_key(self, messages):
+        """Completions are cached per client, model and exact prompt."""
+        payload = json.dumps([type(self).__name__, getattr(self, 'model', ''), messages], separators=(',', ':'))
+        return 'llm:completion:' + hashlib.sha256(payload.encode()).hexdigest()
+
+
+class OpenAIClient(BaseLLMClient):
+    """Chat completions from OpenAI, or any compatible server at
+    ``LLM_BASE_URL``.
+
+    :func:`get_llm_client` shares one instance per process, so the HTTP
+    connection pool and the circuit breaker outlive a single call. Sync
+    callers (WSGI views, workers) use the one blocking client; async
+    callers get a client per event loop, which a short-lived loop should
+    release with :meth:`aclose`. Every
+    request has explicit timeouts, and while the breaker is open calls fail
+    immediately with :class:`CircuitOpenError` instead of waiting on a
+    degraded provider.
+    """
+
+    def __init__(self):
+        import httpx
+        from openai import OpenAI
+
+        self.model = settings.LLM_MODEL
+        self.options = {
+            'api_key': settings.OPENAI_API_KEY,
+            'base_url': settings.LLM_BASE_URL,
+            'timeout': httpx.Timeout(settings.LLM_TIMEOUT, connect=settings.LLM_CONNECT_TIMEOUT),
+            'max_retries': settings.LLM_MAX_RETRIES,
+        }
+        self.client = OpenAI(**self.options)
+        self.breaker = CircuitBreaker(settings.LLM_BREAKER_FAILURES, settings.LLM_BREAKER_RESET)
+        self._async_clients = weakref.WeakKeyDictionary()
+
+    @property
+    def async_client(self):
+        # Async connections belong to the event loop that opened them, so
+        # each loop gets its own pool.
+        from openai import AsyncOpenAI
+
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = self._async_clients[loop] = AsyncOpenAI(**self.options)
+        return client
+
+    @contextmanager
+    def guarded(self):
+        """Run a provider call through the circuit breaker. Rejected
+        requests (4xx other than 429) are our fault, not an outage, so they
+        don't count against the provider."""
+        if not self.breaker.allow():
+            raise CircuitOpenError('The LLM provider is unavailable; not calling it for now.')
+        try:
+            yield
+        except Exception as e:
+            status = getattr(e, 'status_code', None)
+            if status is None or status >= 500 or status == 429:
+                self.breaker.record_failure()
+            raise LLMError(str(e)) from e
+        self.breaker.record_success()
+
+    def complete(self, messages):
+        with self.guarded():
+            response = self.client.chat.completions.create(model=self.model, messages=messages)
+        return response.choices[0].message.content
+
+    def stream(self, messages):
+        with self.guarded():
+            stream = self.client.chat.completions.create(model=self.model, messages=messages, stream=True)
+            with stream:
+                for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+
+    async def acomplete(self, messages):
+        with self.guarded():
+            response = await self.async_client.chat.completions.create(model=self.model, messages=messages)
+        return response.choices[0].message.content
+
+    async def astream(self, messages):
+        with self.guarded():
+            stream = await self.async_client.chat.completions.create(model=self.model, messages=messages, stream=True)
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+    async def aclose(self):
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.close()
+
+
+class StubClient(BaseLLMClient):
+    """Local backend for development and tests: answers instantly without
+    calling any provider."""
+
+    def complete(self, messages):
+        prompt = messages[-1]['content'].strip()
+        return f"Stub summary ({len(prompt)} prompt characters). Keep going, you're doing great!"
+
+    async def acomplete(self, messages):
+        return self.complete(messages)
+
+    def stream(self, messages):
+        first, *rest = self.complete(messages).split(' ')
+        yield first
+        for word in rest:
+            yield ' ' + word
+
+    async def astream(self, messages):
+        for chunk in self.stream(messages):
+            yield chunk
+
+
+def cached_complete(client, messages):
+    """``client.complete(messages)``, reusing the reply to an identical
+    prompt for ``LLM_CACHE_TIMEOUT`` seconds."""
+    key = client.cache_key(messages)
+    content = cache.get(key)
+    if content is None:
+        content = client.complete(messages)
+        cache.set(key, content, settings.LLM_CACHE_TIMEOUT)
+    return content
+
+
+async def acached_complete(client, messages):
+    key = client.cache_key(messages)
+    content = await cache.aget(key)
+    if content is None:
+        content = await client.acomplete(messages)
+        await cache.aset(key, content, settings.LLM_CACHE_TIMEOUT)
+    return content
+
+
+def cached_stream(client, messages):
+    """``client.stream(messages)``, caching the full reply once the stream
+    completes; a cached reply is yielded in one piece."""
+    key = client.cache_key(messages)
+    content = cache.get(key)
+    if content is not None:
+        yield content
+        return
+    parts = []
+    for chunk in client.stream(messages):
+        parts.append(chunk)
+        yield chunk
+    cache.set(key, ''.join(parts), settings.LLM_CACHE_TIMEOUT)
+
+
+async def acached_stream(client, messages):
+    key = client.cache_key(messages)
+    content = await cache.aget(key)
+    if content is not None:
+        yield content
+        return
+    parts = []
+    async for chunk in client.astream(messages):
+        parts.append(chunk)
+        yield chunk
+    await cache.aset(key, ''.join(parts), settings.LLM_CACHE_TIMEOUT)
+
+
+@lru_cache(maxsize=None)
+def _shared_client(path):
+    return import_string(path)()
+
+
+def get_llm_client():
+    """The process-wide instance of the ``LLM_CLIENT`` class."""
+    return _shared_client(settings.LLM_CLIENT)
@@ -0,0 +1,247 @@
+import asyncio
+import json
+import math
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from asgiref.sync import sync_to_async
+from django.db import connection, connections
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+from django.urls import URLPattern, URLResolver, get_resolver
+from django.utils import timezone
+
+from core.metrics import track_queries
+from core.models import Category, MoodEntry, Rewards, Task, User
+
+
+# Views that change state on GET or cannot be rendered without a token.
+# journal_view creates the day's MoodEntry on GET (and locks SQLite under
+# concurrency).
+SKIPPED = {'logout', 'task_complete', 'reward_claim', 'password_reset_confirm', 'journal_view'}
+
+PK_MODELS = {
+    'task_edit': Task,
+    'task_delete': Task,
+    'tasks_by_category': Category,
+    'journal_edit': MoodEntry,
+    'journal_delete': MoodEntry,
+    'reward_edit': Rewards,
+    'reward_delete': Rewards,
+}
+
+
+def iter_patterns(patterns, prefix=''):
+    for entry in patterns:
+        if isinstance(entry, URLResolver):
+            if entry.namespace == 'admin' or str(entry.pattern).startswith('admin/'):
+                continue
+            yield from iter_patterns(entry.url_patterns, prefix + str(entry.pattern))
+        elif isinstance(entry, URLPattern) and entry.name:
+            yield entry.name, prefix + str(entry.pattern)
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    rank = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[rank]
+
+
+class Command(BaseCommand):
+    help = (
+        "Request every URL in the project's URLconf through the test client as "
+        "seeded users, at a configurable concurrency, and report p50/p95/p99 "
+        "latency, queries per request and rows fetched. With --interface asgi the "
+        "same requests go through the ASGI handler, so sync and async views can "
+        "be compared. Summaries are written by the stub LLM client, so no "
+        "provider is called. Seed the database with `manage.py seed_data` first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--prefix', default='seed', help='Username prefix of the seeded users to log in as.')
+        parser.add_argument('--requests', type=int, default=50, help='Requests per URL.')
+        parser.add_argument('--concurrency', type=int, default=4, help='Parallel clients.')
+        parser.add_argument(
+            '--interface', choices=['wsgi', 'asgi', 'both'], default='wsgi',
+            help='Request handler to benchmark: threaded WSGI clients, concurrent ASGI tasks, or both.',
+        )
+        parser.add_argument('--only', nargs='*', help='Only benchmark these URL names.')
+        parser.add_argument('--output', help='Write the results as JSON to this file.')
+        parser.add_argument('--compare', help='Print the p95 change against a previous JSON result file.')
+
+    def handle(self, *args, **options):
+        users = list(User.objects.filter(username__startswith=options['prefix']).order_by('pk')[:options['concurrency']])
+        if not users:
+            raise CommandError(f'No users named "{options["prefix"]}*"; run `manage.py seed_data` first.')
+        targets = self.targets(users, options['only'])
+        interfaces = ['wsgi', 'asgi'] if options['interface'] == 'both' else [options['interface']]
+
+        results = []
+        # The stub client keeps daily_summary_stream deterministic and free.
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'], LLM_CLIENT='core.llm.StubClient'):
+            for name, paths in targets:
+                for interface in interfaces:
+                    if interface == 'asgi':
+                        samples, wall = asyncio.run(self.run_asgi(paths, users, options))
+                    else:
+                        samples, wall = self.run_wsgi(paths, users, options)
+                    results.append(self.summarise(name, interface, samples, wall))
+                    self.report(results[-1])
+
+        payload = {
+            'timestamp': timezone.now().isoformat(),
+            'commit': self.git_commit(),
+            'database': connection.vendor,
+            'concurrency': options['concurrency'],
+            'requests_per_url': options['requests'],
+            'results': results,
+        }
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(payload, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f'Wrote {options["output"]}'))
+        if options['compare']:
+            self.compare(results, options['compare'])
+        if len(interfaces) > 1:
+            self.compare_interfaces(results)
+
+    def targets(self, users, only):
+        targets = []
+        for name, route in iter_patterns(get_resolver().url_patterns):
+            if name in SKIPPED or (only and name not in only):
+                continue
+            model = PK_MODELS.get(name)
+            paths = {}
+            for user in users:
+                if model is not None:
+                    pk = model.objects.filter(user=user).values_list('pk', flat=True).first()
+                    if pk is None:
+                        continue
+                    paths[user.pk] = '/' + route.replace('<int:pk>', str(pk))
+                elif '<' not in route:
+                    paths[user.pk] = '/' + route
+            if paths:
+                targets.append((name, paths))
+        return targets
+
+    def run_wsgi(self, paths, users, options):
+        samples = []
+        lock = threading.Lock()
+        users = [user for user in users if user.pk in paths]
+
+        def worker(index):
+            user = users[index % len(users)]
+            client = Client()
+            client.force_login(user)
+            try:
+                for _ in range(index, options['requests'], options['concurrency']):
+                    with track_queries() as timer:
+                        started = time.perf_counter()
+                        response = client.get(paths[user.pk])
+                        if getattr(response, 'streaming', False):
+                            b''.join(response.streaming_content)
+                        elapsed = time.perf_counter() - started
+                    with lock:
+                        samples.append((elapsed, timer.count, timer.rows if timer.rows_known else None, response.status_code))
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            wall = time.perf_counter()
+            list(pool.map(worker, range(options['concurrency'])))
+            wall = time.perf_counter() - wall
+        return samples, wall
+
+    async def run_asgi(self, paths, users, options):
+        samples = []
+        users = [user for user in users if user.pk in paths]
+
+        async def worker(index):
+            user = users[index % len(users)]
+            client = AsyncClient()
+            await client.aforce_login(user)
+            for _ in range(index, options['requests'], options['concurrency']):
+                with track_queries() as timer:
+                    started = time.perf_counter()
+                    response = await client.get(paths[user.pk])
+                    if getattr(response, 'streaming', False):
+                        if response.is_async:
+                            [chunk async for chunk in response.streaming_content]
+                        else:
+                            await sync_to_async(b''.join)(response.streaming_content)
+                    elapsed = time.perf_counter() - started
+                samples.append((elapsed, timer.count, timer.rows if timer.rows_known else None, response.status_code))
+
+        wall = time.perf_counter()
+        await asyncio.gather(*(worker(index) for index in range(options['concurrency'])))
+        wall = time.perf_counter() - wall
+        await sync_to_async(connections.close_all)()
+        return samples, wall
+
+    def summarise(self, name, interface, samples, wall):
+        latencies = [sample[0] * 1000 for sample in samples]
+        rows = [sample[2] for sample in samples]
+        return {
+            'name': name,
+            'interface': interface,
+            'requests': len(samples),
+            'statuses': sorted({sample[3] for sample in samples}),
+            'throughput_rps': round(len(samples) / wall, 1) if wall else None,
+            'p50_ms': round(percentile(latencies, 50), 2),
+            'p95_ms': round(percentile(latencies, 95), 2),
+            'p99_ms': round(percentile(latencies, 99), 2),
+            'queries_per_request': round(sum(sample[1] for sample in samples) / len(samples), 2),
+            'rows_per_request': round(sum(rows) / len(rows), 1) if None not in rows else None,
+        }
+
+    def report(self, result):
+        rows = '-' if result['rows_per_request'] is None else result['rows_per_request']
+        self.stdout.write(
+            f"{result['name']:<24} {result['interface']:<5} {result['throughput_rps']:>8} req/s  "
+            f"p50 {result['p50_ms']:>8} ms  p95 {result['p95_ms']:>8} ms  p99 {result['p99_ms']:>8} ms  "
+            f"{result['queries_per_request']:>6} queries  {rows} rows  {result['statuses']}"
+        )
+
+    def compare(self, results, path):
+        try:
+            with open(path) as f:
+                previous = {(item['name'], item.get('interface', 'wsgi')): item for item in json.load(f)['results']}
+        except (OSError, ValueError, KeyError) as e:
+            raise CommandError(f'Cannot read {path}: {e}')
+        self.stdout.write(f'\np95 compared with {path}:')
+        for result in results:
+            before = previous.get((result['name'], result['interface']))
+            if before and before['p95_ms']:
+                change = (result['p95_ms'] - before['p95_ms']) / before['p95_ms'] * 100
+                self.stdout.write(
+                    f"{result['name']:<24} {result['interface']:<5} "
+                    f"{before['p95_ms']:>8} -> {result['p95_ms']:>8} ms ({change:+.1f}%)"
+                )
+
+    def compare_interfaces(self, results):
+        by_name = {}
+        for result in results:
+            by_name.setdefault(result['name'], {})[result['interface']] = result
+        self.stdout.write('\nASGI compared with WSGI:')
+        for name, pair in by_name.items():
+            wsgi, asgi = pair.get('wsgi'), pair.get('asgi')
+            if not (wsgi and asgi and wsgi['throughput_rps'] and wsgi['p99_ms']):
+                continue
+            self.stdout.write(
+                f"{name:<24} {asgi['throughput_rps'] / wsgi['throughput_rps']:>6.2f}x req/s  "
+                f"p99 {wsgi['p99_ms']:>8} -> {asgi['p99_ms']:>8} ms"
+            )
+
+    @staticmethod
+    def git_commit():
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+                capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
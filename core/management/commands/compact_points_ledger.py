@@ -0,0 +1,46 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from core.models import PointsTransaction
+
+
+class Command(BaseCommand):
+    help = (
+        "Roll points transactions older than the cutoff up into a single "
+        "'rollup' row per user, so ledger reads only scan recent history."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than', type=int, default=90, help='Age in days of the transactions to compact.')
+        parser.add_argument('--batch-size', type=int, default=500, help='Users compacted per transaction.')
+
+    def handle(self, *args, **options):
+        if options['older_than'] < 1:
+            raise CommandError('--older-than must be at least 1 day.')
+        cutoff = timezone.now() - timedelta(days=options['older_than'])
+        old = PointsTransaction.objects.filter(created_at__lt=cutoff)
+
+        user_ids = list(
+            old.values('user').annotate(rows=Count('pk')).filter(rows__gt=1)
+            .order_by('user').values_list('user', flat=True)
+        )
+        removed = 0
+        for start in range(0, len(user_ids), options['batch_size']):
+            batch = user_ids[start:start + options['batch_size']]
+            with transaction.atomic():
+                totals = old.filter(user_id__in=batch).values('user').annotate(total=Sum('amount')).order_by()
+                rollups = [
+                    PointsTransaction(user_id=row['user'], amount=row['total'],
+                                      kind=PointsTransaction.KIND_ROLLUP, created_at=cutoff)
+                    for row in totals
+                ]
+                removed += old.filter(user_id__in=batch).delete()[0]
+                PointsTransaction.objects.bulk_create(rollups)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Compacted {removed} transactions of {len(user_ids)} user(s) into rollups.'
+        ))
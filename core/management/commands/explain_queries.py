@@ -0,0 +1,95 @@
+import re
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.utils.timezone import localdate
+
+from core.counters import with_status_counts
+from core.models import Category, DailyStats, MoodEntry, PomodoroSession, Rewards, Task, User
+from core.rollups import stats_range
+from core.snapshots import dashboard_counts_queryset, today_tasks_queryset
+
+
+SEQ_SCAN_PATTERNS = {
+    'postgresql': re.compile(r'Seq Scan on (\w+)'),
+    'sqlite': re.compile(r'\bSCAN (\w+)(?! USING (?:COVERING )?INDEX)'),
+}
+
+
+def view_queries(user, today):
+    category = Category.objects.filter(user=user).first()
+    return [
+        ('dashboard', 'counts', dashboard_counts_queryset(user, today)),
+        ('dashboard', 'today tasks', today_tasks_queryset(user, today)[:5]),
+        ('dashboard', 'mood entry', MoodEntry.objects.filter(user=user, date=today).order_by('-time')[:1]),
+        ('dashboard', 'categories', Category.objects.filter(user=user, is_active=True)),
+        ('task_categories', 'status counts', with_status_counts(Category.objects.filter(user=user, is_active=True))),
+        ('tasks_by_category', 'tasks', Task.objects.filter(user=user, category=category).order_by('due_date')),
+        ('pomodoro', 'open tasks', Task.objects.filter(user=user).exclude(status='completed').order_by('-due_date')),
+        ('pomodoro_history', 'sessions', PomodoroSession.objects.filter(user=user, completed=True).order_by('-start_time')),
+        ('pomodoro_history', 'day totals', stats_range(user.pk, today - timedelta(days=30), today)),
+        ('daily_summary', 'day inputs', DailyStats.objects.filter(date=today)),
+        ('journal_history', 'entries', MoodEntry.objects.filter(user=user).order_by('-date', '-time')),
+        ('reward_list', 'rewards', Rewards.objects.filter(user=user, is_active=True)),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN on the queries issued by each view for one user and report "
+        "the ones that fall back to a sequential scan. Run it against a seeded "
+        "database (see `manage.py seed_data`): on tiny tables the planner prefers "
+        "sequential scans anyway."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Username to explain the queries for (default: the user with most tasks).')
+        parser.add_argument('--analyze', action='store_true', help='Use EXPLAIN ANALYZE (PostgreSQL only).')
+        parser.add_argument(
+            '--disable-seqscan', action='store_true',
+            help='SET enable_seqscan = off first, to check that an index is usable at all (PostgreSQL only).',
+        )
+        parser.add_argument('--verbose-plans', action='store_true', help='Print the full plan of every query.')
+
+    def handle(self, *args, **options):
+        vendor = connection.vendor
+        if vendor not in SEQ_SCAN_PATTERNS:
+            raise CommandError(f'Unsupported database backend: {vendor}')
+        postgres_only = options['analyze'] or options['disable_seqscan']
+        if postgres_only and vendor != 'postgresql':
+            raise CommandError('--analyze and --disable-seqscan require PostgreSQL.')
+
+        user = self.get_user(options['user'])
+        if options['disable_seqscan']:
+            with connection.cursor() as cursor:
+                cursor.execute('SET enable_seqscan = off')
+
+        explain_options = {'analyze': True} if options['analyze'] else {}
+        pattern = SEQ_SCAN_PATTERNS[vendor]
+        flagged = 0
+        for view, label, queryset in view_queries(user, localdate()):
+            plan = queryset.explain(**explain_options)
+            tables = sorted(set(pattern.findall(plan)))
+            if tables:
+                flagged += 1
+                self.stdout.write(self.style.WARNING(f'SEQ SCAN  {view} [{label}]: {", ".join(tables)}'))
+            else:
+                self.stdout.write(f'ok        {view} [{label}]')
+            if options['verbose_plans'] or tables:
+                self.stdout.write('\n'.join(f'    {line}' for line in plan.splitlines()))
+
+        summary = f'{flagged} quer{"y" if flagged == 1 else "ies"} fell back to a sequential scan.'
+        self.stdout.write(self.style.WARNING(summary) if flagged else self.style.SUCCESS(summary))
+
+    def get_user(self, username):
+        if username:
+            try:
+                return User.objects.get(username=username)
+            except User.DoesNotExist:
+                raise CommandError(f'User "{username}" does not exist.')
+        user = User.objects.annotate(task_total=Count('task')).order_by('-task_total').first()
+        if user is None:
+            raise CommandError('The database has no users; seed it first.')
+        return user
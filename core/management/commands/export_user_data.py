@@ -0,0 +1,36 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.exports import DATASETS, FORMATS, export_stream
+from core.models import User
+
+
+class Command(BaseCommand):
+    help = "Stream a user's data as CSV or NDJSON, optionally gzip-compressed."
+
+    def add_arguments(self, parser):
+        parser.add_argument('username')
+        parser.add_argument('--dataset', default='all', choices=['all', *DATASETS])
+        parser.add_argument('--format', default='ndjson', choices=FORMATS)
+        parser.add_argument('--gzip', action='store_true')
+        parser.add_argument('--output', '-o', help='File to write to (default: stdout).')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(f'User "{options["username"]}" does not exist.')
+        try:
+            chunks = export_stream(user, options['dataset'], options['format'], options['gzip'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if options['output']:
+            with open(options['output'], 'wb') as output:
+                for chunk in chunks:
+                    output.write(chunk)
+        else:
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
@@ -0,0 +1,74 @@
+import asyncio
+import random
+from datetime import date
+
+from asgiref.sync import sync_to_async
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.llm import LLMError, acached_complete, get_llm_client
+from core.models import AISummary
+from core.summaries import build_messages, collect_day_inputs, fingerprint, save_summary
+from core.throttling import TokenBucket
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate the AISummary of a day for every user who was active on it. "
+        "Users whose summary was written from the same inputs are skipped, so "
+        "an interrupted run can simply be started again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help='Day to summarise as YYYY-MM-DD (default: today).')
+        parser.add_argument('--concurrency', type=int, default=8, help='Maximum number of LLM calls in flight.')
+        parser.add_argument('--rate', type=float, default=5.0, help='Maximum LLM calls started per second.')
+        parser.add_argument('--retries', type=int, default=3, help='Attempts per user before giving up.')
+        parser.add_argument('--backoff', type=float, default=1.0, help='Base delay in seconds for exponential backoff.')
+        parser.add_argument('--force', action='store_true', help='Regenerate summaries that are up to date.')
+
+    def handle(self, *args, **options):
+        try:
+            day = date.fromisoformat(options['date']) if options['date'] else timezone.localdate()
+        except ValueError:
+            raise CommandError('--date must be in YYYY-MM-DD format.')
+        if options['concurrency'] < 1 or options['rate'] <= 0 or options['retries'] < 1:
+            raise CommandError('--concurrency, --rate and --retries must be positive.')
+
+        inputs = collect_day_inputs(day)
+        if not options['force']:
+            done = dict(AISummary.objects.filter(date=day, user_id__in=list(inputs)).values_list('user_id', 'fingerprint'))
+            inputs = {user_id: item for user_id, item in inputs.items() if done.get(user_id) != fingerprint(item)}
+        self.stdout.write(f'{len(inputs)} active user(s) to summarise for {day}.')
+
+        generated, failed = asyncio.run(self.generate_all(day, list(inputs.values()), options))
+        self.stdout.write(self.style.SUCCESS(f'Generated {generated} summaries, {failed} failed.'))
+
+    async def generate_all(self, day, inputs, options):
+        client = get_llm_client()
+        semaphore = asyncio.Semaphore(options['concurrency'])
+        bucket = TokenBucket(options['rate'])
+        save = sync_to_async(save_summary)
+
+        async def generate(item):
+            async with semaphore:
+                for attempt in range(options['retries']):
+                    await bucket.acquire()
+                    try:
+                        content = await acached_complete(client, build_messages(item))
+                    except LLMError as e:
+                        if attempt + 1 == options['retries']:
+                            self.stderr.write(f'{item.username}: giving up after {attempt + 1} attempts ({e})')
+                            return False
+                        delay = options['backoff'] * 2 ** attempt
+                        await asyncio.sleep(delay + random.uniform(0, delay))
+                    else:
+                        await save(item.user_id, day, content, fingerprint(item))
+                        return True
+
+        try:
+            results = await asyncio.gather(*(generate(item) for item in inputs))
+        finally:
+            await client.aclose()
+        generated = sum(results)
+        return generated, len(results) - generated
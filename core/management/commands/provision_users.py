@@ -0,0 +1,60 @@
+import csv
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.provisioning import create_users
+
+
+class Command(BaseCommand):
+    help = (
+        "Create many users at once, either from a CSV file (columns: username, "
+        "email, and optionally password, first_name, last_name) or as numbered "
+        "load-test accounts. Users and their default categories are inserted "
+        "with bulk_create; existing usernames are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--csv', help='CSV file of users to create.')
+        parser.add_argument('--count', type=int, help='Create this many numbered users instead of reading a CSV.')
+        parser.add_argument('--prefix', default='loadtest', help='Username prefix for --count (default: loadtest).')
+        parser.add_argument('--password', help='Password for users without one; omit to make them SSO-only (unusable password).')
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--hash-workers', type=int, default=4, help='Threads used to hash passwords in parallel.')
+
+    def handle(self, *args, **options):
+        if bool(options['csv']) == bool(options['count']):
+            raise CommandError('Pass exactly one of --csv or --count.')
+        rows = self.read_csv(options['csv']) if options['csv'] else self.numbered(options['prefix'], options['count'])
+
+        created = skipped = 0
+        batch = []
+        with ThreadPoolExecutor(max_workers=options['hash_workers']) as hasher:
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= options['batch_size']:
+                    c, s = self.create_batch(batch, options['password'], hasher)
+                    created, skipped, batch = created + c, skipped + s, []
+            if batch:
+                c, s = self.create_batch(batch, options['password'], hasher)
+                created, skipped = created + c, skipped + s
+
+        self.stdout.write(self.style.SUCCESS(f'Created {created} user(s), skipped {skipped} existing.'))
+
+    def read_csv(self, path):
+        try:
+            with open(path, newline='', encoding='utf-8-sig') as f:
+                for number, row in enumerate(csv.DictReader(f), start=2):
+                    if not (row.get('username') or '').strip():
+                        raise CommandError(f'{path}:{number}: missing username.')
+                    yield row
+        except OSError as e:
+            raise CommandError(str(e))
+
+    def numbered(self, prefix, count):
+        for i in range(1, count + 1):
+            yield {'username': f'{prefix}{i}', 'email': f'{prefix}{i}@example.com'}
+
+    def create_batch(self, rows, default_password, hasher):
+        users, skipped = create_users(rows, default_password, hasher.map)
+        return len(users), skipped
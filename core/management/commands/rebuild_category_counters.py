@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from core import counters
+from core.models import Category
+
+
+class Command(BaseCommand):
+    help = 'Recompute the denormalized per-category task status counters from the Task table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, help='Only rebuild the categories of this user id.')
+
+    def handle(self, *args, **options):
+        categories = Category.objects.all()
+        if options['user']:
+            categories = categories.filter(user_id=options['user'])
+        updated = counters.rebuild(categories)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt counters for {updated} categories.'))
@@ -0,0 +1,23 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import rollups
+
+
+class Command(BaseCommand):
+    help = 'Recompute the DailyStats rollups from the Task, PomodoroSession and MoodEntry tables.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', help='Only rebuild this user id (repeatable).')
+        parser.add_argument('--since', help='First day to rebuild, as YYYY-MM-DD.')
+        parser.add_argument('--until', help='Last day to rebuild, as YYYY-MM-DD.')
+
+    def handle(self, *args, **options):
+        try:
+            since = date.fromisoformat(options['since']) if options['since'] else None
+            until = date.fromisoformat(options['until']) if options['until'] else None
+        except ValueError:
+            raise CommandError('--since and --until must be in YYYY-MM-DD format.')
+        written = rollups.rebuild(options['user'], since, until)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {written} daily stats rows.'))
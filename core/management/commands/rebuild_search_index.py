@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from core import search
+
+
+class Command(BaseCommand):
+    help = 'Recreate the full-text search index (and, on SQLite, its triggers) and repopulate it.'
+
+    def handle(self, *args, **options):
+        with connection.schema_editor() as schema_editor:
+            search.install(schema_editor)
+        self.stdout.write(self.style.SUCCESS(f'Search index rebuilt on {connection.vendor}.'))
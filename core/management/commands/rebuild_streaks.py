@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.backends import invalidate_cached_users
+from core.models import User
+from core.streaks import current_runs
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute streak_days and last_active_date for all users from their "
+        "task, pomodoro and journal history with a single window-function query."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, nargs='*', help='Only reconcile these user ids.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        runs = {user_id: (last_day, length) for user_id, last_day, length in current_runs(options['user'])}
+
+        users = User.objects.only('pk', 'streak_days', 'last_active_date').order_by('pk')
+        if options['user']:
+            users = users.filter(pk__in=options['user'])
+
+        changed = []
+        for user in users.iterator(chunk_size=options['batch_size']):
+            last_day, length = runs.get(user.pk, (None, 0))
+            if (user.last_active_date, user.streak_days) != (last_day, length):
+                user.last_active_date, user.streak_days = last_day, length
+                changed.append(user)
+
+        with transaction.atomic():
+            User.objects.bulk_update(changed, ['streak_days', 'last_active_date'], batch_size=options['batch_size'])
+            invalidate_cached_users(*(user.pk for user in changed))
+        self.stdout.write(self.style.SUCCESS(f'Updated the streaks of {len(changed)} user(s).'))
@@ -0,0 +1,131 @@
+import json
+import random
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+
+
+REPLY = (
+    "What a day! You kept your focus through {sessions} and showed up for yourself. "
+    "Celebrate the small wins, drink some water, and pick one task to start with tomorrow."
+)
+
+
+class FakeChatHandler(BaseHTTPRequestHandler):
+    """Minimal OpenAI-compatible ``/chat/completions`` endpoint."""
+
+    protocol_version = 'HTTP/1.1'
+    server_version = 'FakeLLM/1.0'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def do_POST(self):
+        try:
+            self.respond()
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up, e.g. on its read timeout.
+            self.close_connection = True
+
+    def respond(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            body = None
+        if not self.path.rstrip('/').endswith('/chat/completions') or not isinstance(body, dict):
+            return self.send_json(404, {'error': {'message': 'Not found', 'type': 'invalid_request_error'}})
+
+        time.sleep(self.server.latency)
+        if random.random() < self.server.fail_rate:
+            return self.send_json(503, {'error': {'message': 'Simulated outage', 'type': 'server_error'}})
+
+        prompt = (body.get('messages') or [{}])[-1].get('content', '')
+        sessions = next((line.split(':', 1)[1].split(',')[0].strip() for line in prompt.splitlines()
+                         if line.startswith('Focus:')), 'the day')
+        reply = REPLY.format(sessions=sessions)
+        completion_id = f'chatcmpl-{uuid.uuid4().hex[:12]}'
+        model = body.get('model', 'fake')
+        if body.get('stream'):
+            self.stream(completion_id, model, reply)
+        else:
+            self.send_json(200, {
+                'id': completion_id,
+                'object': 'chat.completion',
+                'created': int(time.time()),
+                'model': model,
+                'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': reply}, 'finish_reason': 'stop'}],
+                'usage': {'prompt_tokens': len(prompt) // 4, 'completion_tokens': len(reply) // 4,
+                          'total_tokens': (len(prompt) + len(reply)) // 4},
+            })
+
+    def send_json(self, status, data):
+        payload = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def stream(self, completion_id, model, reply):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+
+        def chunk(delta, finish_reason=None):
+            event = {
+                'id': completion_id,
+                'object': 'chat.completion.chunk',
+                'created': int(time.time()),
+                'model': model,
+                'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}],
+            }
+            self.wfile.write(f'data: {json.dumps(event)}\n\n'.encode())
+            self.wfile.flush()
+
+        chunk({'role': 'assistant', 'content': ''})
+        first, *rest = reply.split(' ')
+        for word in [first] + [' ' + word for word in rest]:
+            time.sleep(self.server.token_delay)
+            chunk({'content': word})
+        chunk({}, 'stop')
+        self.wfile.write(b'data: [DONE]\n\n')
+        self.wfile.flush()
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a local OpenAI-compatible chat completions server that answers "
+        "with canned summaries, streamed or not. Point LLM_BASE_URL at it to "
+        "develop and load-test the summary flow without calling OpenAI."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--latency', type=float, default=0.5, help='Seconds before the first byte of each reply.')
+        parser.add_argument('--token-delay', type=float, default=0.05, help='Seconds between streamed chunks.')
+        parser.add_argument('--fail-rate', type=float, default=0.0, help='Share of requests answered with a 503 (0-1).')
+        parser.add_argument('--verbose-requests', action='store_true', help='Log every request.')
+
+    def handle(self, *args, **options):
+        server = ThreadingHTTPServer((options['host'], options['port']), FakeChatHandler)
+        server.daemon_threads = True
+        server.latency = options['latency']
+        server.token_delay = options['token_delay']
+        server.fail_rate = options['fail_rate']
+        server.verbose = options['verbose_requests']
+        host, port = server.server_address[:2]
+        self.stdout.write(f'Fake LLM server on http://{host}:{port}/v1 (Ctrl+C to stop)')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
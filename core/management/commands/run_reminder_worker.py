@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core import reminders
+
+
+class Command(BaseCommand):
+    help = 'Email wellness reminders to users as they fall due.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-sleep', type=float, default=60.0, help='Longest time to sleep between checks, in seconds.')
+        parser.add_argument('--batch-size', type=int, default=reminders.BATCH_SIZE, help='Reminders sent per mail batch.')
+        parser.add_argument('--once', action='store_true', help='Send the reminders due now and exit.')
+
+    def handle(self, *args, **options):
+        sent = 0
+        while True:
+            sent += reminders.send_due_reminders(batch_size=options['batch_size'])
+            if options['once']:
+                break
+            due = reminders.next_due_at()
+            delay = options['max_sleep'] if due is None else (due - timezone.now()).total_seconds()
+            time.sleep(min(max(delay, 0.0), options['max_sleep']))
+        self.stdout.write(self.style.SUCCESS(f'Sent {sent} reminder(s).'))
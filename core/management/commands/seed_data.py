@@ -0,0 +1,143 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, time, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from core import counters, pomodoro, rollups
+from core.models import Category, MoodEntry, PointsTransaction, PomodoroSession, Rewards, Task, User
+from core.provisioning import create_users
+from core.streaks import current_runs
+
+
+SEED_PASSWORD = 'neurozen'
+
+TITLES = ['Write report', 'Read chapter', 'Call mom', 'Gym session', 'Plan week', 'Review notes',
+          'Clean desk', 'Meditate', 'Reply to emails', 'Practice guitar', 'Grocery shopping', 'Study flashcards']
+REWARD_TITLES = ['Movie night', 'Fancy coffee', 'New book', 'Day off', 'Game hour', 'Dessert']
+PRIORITIES = (['low', 'medium', 'high'], [3, 5, 2])
+STATUSES = (['todo', 'in_progress', 'completed'], [3, 2, 5])
+MOODS = (['very_happy', 'happy', 'neutral', 'sad', 'very_sad'], [1, 3, 4, 2, 1])
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate synthetic users with realistic task, pomodoro, journal and "
+        "reward history for load testing and query-plan checks. Seeded users "
+        f"share the password '{SEED_PASSWORD}' and are named <prefix><n>."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--days', type=int, default=180, help='Days of history per user.')
+        parser.add_argument('--tasks', type=float, default=3.0, help='Median number of tasks per user per week.')
+        parser.add_argument('--prefix', default='seed')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed, for reproducible data sets.')
+        parser.add_argument('--batch-size', type=int, default=50, help='Users generated per transaction.')
+
+    def handle(self, *args, **options):
+        if options['users'] < 1 or options['days'] < 1:
+            raise CommandError('--users and --days must be positive.')
+        rng = random.Random(options['seed'])
+        rows = [{'username': f"{options['prefix']}{i}", 'email': f"{options['prefix']}{i}@example.com"}
+                for i in range(1, options['users'] + 1)]
+
+        with ThreadPoolExecutor(max_workers=4) as hasher:
+            totals = {'users': 0, 'tasks': 0, 'pomodoros': 0, 'moods': 0, 'rewards': 0}
+            for start in range(0, len(rows), options['batch_size']):
+                users, _ = create_users(rows[start:start + options['batch_size']], SEED_PASSWORD, hasher.map)
+                if users:
+                    with transaction.atomic():
+                        for key, value in self.seed_users(users, rng, options).items():
+                            totals[key] += value
+                    totals['users'] += len(users)
+
+        self.stdout.write(self.style.SUCCESS(
+            'Seeded {users} users with {tasks} tasks, {pomodoros} pomodoro sessions, '
+            '{moods} mood entries and {rewards} rewards.'.format(**totals)
+        ))
+
+    def seed_users(self, users, rng, options):
+        today = timezone.localdate()
+        categories = {}
+        for category in Category.objects.filter(user__in=users):
+            categories.setdefault(category.user_id, []).append(category)
+
+        tasks, sessions, moods, mood_dates, rewards = [], [], [], [], []
+        for user in users:
+            # Activity is heavy-tailed: most users are casual, a few are power users.
+            activity = rng.lognormvariate(0, 0.8)
+            weeks = options['days'] / 7
+            for _ in range(int(options['tasks'] * weeks * activity)):
+                due = today + timedelta(days=rng.randint(-options['days'], 14))
+                status = rng.choices(*STATUSES)[0] if due <= today else rng.choice(['todo', 'in_progress'])
+                due_at = self.at(due, rng.randint(8, 20))
+                tasks.append(Task(
+                    user=user,
+                    category=rng.choice(categories[user.pk]),
+                    title=rng.choice(TITLES),
+                    priority=rng.choices(*PRIORITIES)[0],
+                    status=status,
+                    due_date=due_at,
+                    points=rng.choice([5, 10, 10, 15, 20]),
+                    completed_at=due_at if status == 'completed' else None,
+                ))
+            for offset in range(options['days']):
+                day = today - timedelta(days=offset)
+                if rng.random() < min(0.9, 0.4 * activity):
+                    for n in range(rng.randint(1, 6)):
+                        start = self.at(day, 9 + n, rng.randint(0, 30))
+                        completed = rng.random() < 0.85
+                        sessions.append(PomodoroSession(
+                            user=user, start_time=start, duration=user.focus_time, completed=completed,
+                            end_time=start + timedelta(minutes=user.focus_time) if completed else None,
+                        ))
+                if rng.random() < min(0.9, 0.35 * activity):
+                    moods.append(MoodEntry(
+                        user=user, mood=rng.choices(*MOODS)[0], water_intake=rng.randint(0, 10),
+                        exercised=rng.random() < 0.4, notes=rng.choice(['', '', 'Good day.', 'Tired but ok.']),
+                    ))
+                    mood_dates.append((day, time(rng.randint(18, 22), rng.randint(0, 59))))
+            for _ in range(rng.randint(0, 6)):
+                rewards.append(Rewards(user=user, title=rng.choice(REWARD_TITLES), points=rng.choice([20, 50, 100, 200])))
+
+        Task.objects.bulk_create(tasks, batch_size=1000)
+        PomodoroSession.objects.bulk_create(sessions, batch_size=1000)
+        Rewards.objects.bulk_create(rewards, batch_size=1000)
+        # MoodEntry.date/time are auto_now_add, so back-date them after insert.
+        MoodEntry.objects.bulk_create(moods, batch_size=1000)
+        for entry, (day, at) in zip(moods, mood_dates):
+            entry.date, entry.time = day, at
+        MoodEntry.objects.bulk_update(moods, ['date', 'time'], batch_size=1000)
+
+        self.sync_aggregates(users)
+        return {'tasks': len(tasks), 'pomodoros': len(sessions), 'moods': len(moods), 'rewards': len(rewards)}
+
+    def sync_aggregates(self, users):
+        counters.rebuild(Category.objects.filter(user__in=users))
+        pomodoro.rebuild_totals(User.objects.filter(pk__in=[user.pk for user in users]))
+        rollups.rebuild([user.pk for user in users])
+
+        completed = (Task.objects.filter(user__in=users, status='completed')
+                     .values('user').annotate(total=Sum('points'), count=Count('pk')).order_by())
+        totals = {row['user']: row for row in completed}
+        runs = {user_id: (last_day, length) for user_id, last_day, length in current_runs([u.pk for u in users])}
+        for user in users:
+            row = totals.get(user.pk, {'total': 0, 'count': 0})
+            user.points, user.total_completed_tasks = row['total'], row['count']
+            user.last_active_date, user.streak_days = runs.get(user.pk, (None, 0))
+        User.objects.bulk_update(
+            users, ['points', 'total_completed_tasks', 'last_active_date', 'streak_days'], batch_size=1000,
+        )
+        PointsTransaction.objects.bulk_create(
+            [PointsTransaction(user=user, amount=user.points, kind=PointsTransaction.KIND_ROLLUP)
+             for user in users if user.points],
+            batch_size=1000,
+        )
+
+    @staticmethod
+    def at(day, hour, minute=0):
+        return timezone.make_aware(datetime.combine(day, time(hour % 24, minute)))
@@ -0,0 +1,29 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.pomodoro import STALE_AFTER, sweep_stale_sessions
+
+
+class Command(BaseCommand):
+    help = (
+        "Close Pomodoro sessions that were started but never ended. Closed "
+        "sessions are kept as not completed; use --discard to delete them. "
+        "Meant to run periodically, e.g. hourly from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than', type=int, default=int(STALE_AFTER.total_seconds() // 60),
+            help='Minutes after which an open session counts as abandoned.',
+        )
+        parser.add_argument('--discard', action='store_true', help='Delete abandoned sessions instead of closing them.')
+
+    def handle(self, *args, **options):
+        if options['older_than'] < 1:
+            raise CommandError('--older-than must be positive.')
+        swept, user_ids = sweep_stale_sessions(
+            older_than=timedelta(minutes=options['older_than']), discard=options['discard'],
+        )
+        action = 'Discarded' if options['discard'] else 'Closed'
+        self.stdout.write(self.style.SUCCESS(f'{action} {swept} abandoned session(s) of {len(user_ids)} user(s).'))
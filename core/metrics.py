@@ -0,0 +1,144 @@
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Any other method a client sends is counted as 'other', so the label set
+# stays bounded.
+HTTP_METHODS = frozenset({'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'})
+
+_active_timers = ContextVar('neurozen_query_timers', default=())
+
+
+class QueryTimer:
+    __slots__ = ('count', 'elapsed', 'rows', 'rows_known')
+
+    def __init__(self):
+        self.count = 0
+        self.elapsed = 0.0
+        self.rows = 0
+        self.rows_known = True
+
+
+@contextmanager
+def track_queries(timer=None):
+    """Count the SQL queries run in the current context, adding to
+    ``timer`` if one is passed.
+
+    The timer lives in a context variable rather than in a per-connection
+    ``execute_wrapper``, so queries the async ORM runs on worker threads
+    are counted as well.
+    """
+    timer = timer or QueryTimer()
+    token = _active_timers.set(_active_timers.get() + (timer,))
+    try:
+        yield timer
+    finally:
+        _active_timers.reset(token)
+
+
+def _query_hook(execute, sql, params, many, context):
+    timers = _active_timers.get()
+    if not timers:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        rowcount = getattr(context['cursor'], 'rowcount', -1)
+        for timer in timers:
+            timer.count += 1
+            timer.elapsed += elapsed
+            if rowcount is None or rowcount < 0:
+                timer.rows_known = False
+            else:
+                timer.rows += rowcount
+
+
+def install_query_hook(sender, connection, **kwargs):
+    """``connection_created`` receiver adding the query hook to every
+    database connection once."""
+    if _query_hook not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_query_hook)
+
+
+class _ViewStats:
+    __slots__ = ('buckets', 'duration', 'count', 'queries', 'sql_time')
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.duration = 0.0
+        self.count = 0
+        self.queries = 0
+        self.sql_time = 0.0
+
+
+class MetricsRegistry:
+    """In-process request metrics. Each worker process keeps its own
+    registry, so Prometheus should scrape every process (or sum them)."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.views = defaultdict(_ViewStats)
+        self.requests = defaultdict(int)
+
+    def observe(self, view, method, status, duration, queries, sql_time):
+        method = method if method in HTTP_METHODS else 'other'
+        with self.lock:
+            stats = self.views[view]
+            stats.buckets[bisect_left(LATENCY_BUCKETS, duration)] += 1
+            stats.duration += duration
+            stats.count += 1
+            stats.queries += queries
+            stats.sql_time += sql_time
+            self.requests[(view, method, status)] += 1
+
+    def reset(self):
+        with self.lock:
+            self.views.clear()
+            self.requests.clear()
+
+    def render(self):
+        """Return the metrics in the Prometheus text exposition format."""
+        with self.lock:
+            views = {name: (list(s.buckets), s.duration, s.count, s.queries, s.sql_time) for name, s in self.views.items()}
+            requests = dict(self.requests)
+
+        lines = [
+            '# HELP neurozen_http_requests_total Requests handled, by view, method and status.',
+            '# TYPE neurozen_http_requests_total counter',
+        ]
+        for (view, method, status), total in sorted(requests.items()):
+            lines.append(f'neurozen_http_requests_total{{view="{view}",method="{method}",status="{status}"}} {total}')
+
+        lines += [
+            '# HELP neurozen_http_request_duration_seconds Request latency, by view.',
+            '# TYPE neurozen_http_request_duration_seconds histogram',
+        ]
+        for view, (buckets, duration, count, _, _) in sorted(views.items()):
+            cumulative = 0
+            for bound, hits in zip((*LATENCY_BUCKETS, '+Inf'), buckets):
+                cumulative += hits
+                lines.append(f'neurozen_http_request_duration_seconds_bucket{{view="{view}",le="{bound}"}} {cumulative}')
+            lines.append(f'neurozen_http_request_duration_seconds_sum{{view="{view}"}} {duration:.6f}')
+            lines.append(f'neurozen_http_request_duration_seconds_count{{view="{view}"}} {count}')
+
+        lines += [
+            '# HELP neurozen_db_queries_total SQL queries executed, by view.',
+            '# TYPE neurozen_db_queries_total counter',
+        ]
+        lines += [f'neurozen_db_queries_total{{view="{view}"}} {s[3]}' for view, s in sorted(views.items())]
+        lines += [
+            '# HELP neurozen_db_query_duration_seconds_total Time spent in SQL, by view.',
+            '# TYPE neurozen_db_query_duration_seconds_total counter',
+        ]
+        lines += [f'neurozen_db_query_duration_seconds_total{{view="{view}"}} {s[4]:.6f}' for view, s in sorted(views.items())]
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
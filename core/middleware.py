@@ -0,0 +1,92 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from core.metrics import registry, track_queries
+
+
+class RequestMetricsMiddleware:
+    """Record latency, SQL query count and SQL time per resolved URL name,
+    and optionally expose them to the browser in a ``Server-Timing`` header.
+
+    Streaming responses (exports, summary events) are recorded when the
+    stream ends, so their latency and queries cover the whole body; their
+    ``Server-Timing`` header can only cover the time to the first byte.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.server_timing = getattr(settings, 'METRICS_SERVER_TIMING', False)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with track_queries() as timer:
+            started = time.perf_counter()
+            response = self.get_response(request)
+            duration = time.perf_counter() - started
+        return self.record(request, response, duration, timer)
+
+    async def __acall__(self, request):
+        with track_queries() as timer:
+            started = time.perf_counter()
+            response = await self.get_response(request)
+            duration = time.perf_counter() - started
+        return self.record(request, response, duration, timer)
+
+    def record(self, request, response, duration, timer):
+        match = request.resolver_match
+        view = (match.url_name or match.view_name) if match else 'unresolved'
+
+        def observe(duration):
+            registry.observe(view, request.method, response.status_code, duration, timer.count, timer.elapsed)
+
+        if response.streaming:
+            content = response.streaming_content
+            stream = _atimed if response.is_async else _timed
+            response.streaming_content = stream(content, timer, time.perf_counter() - duration, observe)
+        else:
+            observe(duration)
+
+        if self.server_timing:
+            response['Server-Timing'] = (
+                f'app;dur={duration * 1000:.1f}, '
+                f'db;dur={timer.elapsed * 1000:.1f};desc="{timer.count} queries"'
+            )
+        return response
+
+
+def _timed(content, timer, started, observe):
+    iterator = iter(content)
+    try:
+        while True:
+            with track_queries(timer):
+                chunk = next(iterator, None)
+            if chunk is None:
+                break
+            yield chunk
+    finally:
+        if hasattr(iterator, 'close'):
+            iterator.close()
+        observe(time.perf_counter() - started)
+
+
+async def _atimed(content, timer, started, observe):
+    iterator = aiter(content)
+    try:
+        while True:
+            with track_queries(timer):
+                chunk = await anext(iterator, None)
+            if chunk is None:
+                break
+            yield chunk
+    finally:
+        if hasattr(iterator, 'aclose'):
+            await iterator.aclose()
+        observe(time.perf_counter() - started)
@@ -0,0 +1,47 @@
+# Generated by Django 5.2 on 2026-10-18 07:37
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_counters(apps, schema_editor):
+    Category = apps.get_model('core', 'Category')
+    Task = apps.get_model('core', 'Task')
+    fields = {'todo': 'todo_count', 'in_progress': 'in_progress_count', 'completed': 'completed_count'}
+
+    totals = {}
+    for row in Task.objects.values('category', 'status').annotate(total=Count('pk')).order_by():
+        totals.setdefault(row['category'], {})[row['status']] = row['total']
+
+    batch = []
+    for category in Category.objects.filter(pk__in=totals.keys()).only('pk'):
+        for status, field in fields.items():
+            setattr(category, field, totals[category.pk].get(status, 0))
+        batch.append(category)
+    Category.objects.bulk_update(batch, list(fields.values()), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_alter_category_name'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='completed_count',
+            field=models.PositiveIntegerField(default=0, help_text='Denormalized number of completed tasks.'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='in_progress_count',
+            field=models.PositiveIntegerField(default=0, help_text='Denormalized number of tasks in "In Progress".'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='todo_count',
+            field=models.PositiveIntegerField(default=0, help_text='Denormalized number of tasks in "To Do".'),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2 on 2026-10-18 07:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_category_task_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='moodentry',
+            index=models.Index(fields=['user', '-date', '-time'], name='mood_user_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pomodorosession',
+            index=models.Index(fields=['user', 'start_time'], name='pomodoro_user_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pomodorosession',
+            index=models.Index(condition=models.Q(('completed', True)), fields=['user', '-start_time'], name='pomodoro_user_done_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['user', 'due_date'], name='task_user_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['user', 'status'], name='task_user_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('status', 'completed'), _negated=True), fields=['user', 'due_date'], name='task_user_open_due_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2 on 2026-10-18 07:40
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def open_ledgers(apps, schema_editor):
+    User = apps.get_model('core', 'User')
+    PointsTransaction = apps.get_model('core', 'PointsTransaction')
+    PointsTransaction.objects.bulk_create(
+        (PointsTransaction(user_id=user_id, amount=points, kind='rollup')
+         for user_id, points in User.objects.filter(points__gt=0).values_list('pk', 'points').iterator()),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_summary_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PointsTransaction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount', models.IntegerField(help_text='Points added (positive) or spent (negative).')),
+                ('kind', models.CharField(choices=[('task', 'Task completed'), ('reward', 'Reward claimed'), ('adjustment', 'Adjustment'), ('rollup', 'Rolled-up history')], max_length=20)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('reward', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='points_transactions', to='core.rewards')),
+                ('task', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='points_transactions', to='core.task')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='points_transactions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', '-created_at'], name='points_user_created_idx')],
+            },
+        ),
+        migrations.RunPython(open_ledgers, migrations.RunPython.noop),
+    ]
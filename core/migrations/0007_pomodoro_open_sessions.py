@@ -0,0 +1,34 @@
+# Generated by Django 5.2 on 2026-10-18 07:50
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_totals(apps, schema_editor):
+    User = apps.get_model('core', 'User')
+    Task = apps.get_model('core', 'Task')
+    PomodoroSession = apps.get_model('core', 'PomodoroSession')
+
+    sessions = PomodoroSession.objects.filter(completed=True).order_by()
+    per_user = sessions.filter(user=OuterRef('pk')).values('user').annotate(total=Count('pk')).values('total')
+    per_task = sessions.filter(task=OuterRef('pk')).values('task').annotate(total=Sum('duration')).values('total')
+    User.objects.update(total_pomodoro_sessions=Coalesce(Subquery(per_user, output_field=IntegerField()), Value(0)))
+    Task.objects.filter(pk__in=sessions.values('task')).update(
+        actual_completed_at=Subquery(per_task, output_field=IntegerField()),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_points_transaction'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pomodorosession',
+            index=models.Index(condition=models.Q(('end_time__isnull', True)), fields=['start_time'], name='pomodoro_open_idx'),
+        ),
+        migrations.RunPython(backfill_totals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2 on 2026-10-18 07:52
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+
+
+def backfill_stats(apps, schema_editor):
+    DailyStats = apps.get_model('core', 'DailyStats')
+    Task = apps.get_model('core', 'Task')
+    PomodoroSession = apps.get_model('core', 'PomodoroSession')
+    MoodEntry = apps.get_model('core', 'MoodEntry')
+
+    rows = {}
+
+    def row(user_id, day):
+        if (user_id, day) not in rows:
+            rows[(user_id, day)] = DailyStats(user_id=user_id, date=day)
+        return rows[(user_id, day)]
+
+    for item in (Task.objects.filter(due_date__isnull=False).annotate(day=TruncDate('due_date'))
+                 .values('user', 'day').annotate(due=Count('pk'), completed=Count('pk', filter=Q(status='completed')))
+                 .order_by()):
+        stats = row(item['user'], item['day'])
+        stats.tasks_due, stats.tasks_completed = item['due'], item['completed']
+    for item in (Task.objects.filter(status='completed', completed_at__isnull=False, points__gt=0)
+                 .annotate(day=TruncDate('completed_at')).values('user', 'day').annotate(points=Sum('points'))
+                 .order_by()):
+        row(item['user'], item['day']).points_earned = item['points']
+    for item in (PomodoroSession.objects.filter(completed=True).annotate(day=TruncDate('start_time'))
+                 .values('user', 'day').annotate(count=Count('pk'), minutes=Sum('duration')).order_by()):
+        stats = row(item['user'], item['day'])
+        stats.pomodoros, stats.focus_minutes = item['count'], item['minutes'] or 0
+    for user_id, day, mood, water, exercised in (MoodEntry.objects.order_by('user', 'date', 'time')
+                                                 .values_list('user', 'date', 'mood', 'water_intake', 'exercised')):
+        stats = row(user_id, day)
+        stats.mood, stats.water_intake, stats.exercised = mood, water, exercised
+
+    DailyStats.objects.bulk_create(rows.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_pomodoro_open_sessions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('tasks_due', models.PositiveIntegerField(default=0)),
+                ('tasks_completed', models.PositiveIntegerField(default=0, help_text='Tasks due on this day that are completed.')),
+                ('pomodoros', models.PositiveIntegerField(default=0, help_text='Completed Pomodoro sessions started on this day.')),
+                ('focus_minutes', models.PositiveIntegerField(default=0)),
+                ('points_earned', models.PositiveIntegerField(default=0, help_text='Points of the tasks completed on this day.')),
+                ('mood', models.CharField(blank=True, choices=[('very_happy', 'Very Happy'), ('happy', 'Happy'), ('neutral', 'Neutral'), ('sad', 'Sad'), ('very_sad', 'Very Sad')], max_length=20)),
+                ('water_intake', models.PositiveIntegerField(blank=True, null=True)),
+                ('exercised', models.BooleanField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'Daily stats',
+                'indexes': [models.Index(fields=['date'], name='dailystats_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'date'), name='dailystats_user_date_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill_stats, migrations.RunPython.noop),
+    ]
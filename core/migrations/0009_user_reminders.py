@@ -0,0 +1,44 @@
+# Generated by Django 5.2 on 2026-10-18 08:00
+
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+INTERVALS = {
+    '15min': timedelta(minutes=15),
+    '30min': timedelta(minutes=30),
+    'hourly': timedelta(hours=1),
+    'daily': timedelta(days=1),
+}
+
+
+def schedule_reminders(apps, schema_editor):
+    User = apps.get_model('core', 'User')
+    now = timezone.now()
+    users = User.objects.filter(enable_notifications=True, is_active=True).exclude(email='')
+    for frequency, interval in INTERVALS.items():
+        users.filter(reminder_frequency=frequency).update(next_reminder_at=now + interval)
+    users.exclude(reminder_frequency__in=INTERVALS).update(next_reminder_at=now + INTERVALS['hourly'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('core', '0008_daily_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='next_reminder_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('next_reminder_at__isnull', False)), fields=['next_reminder_at'], name='user_next_reminder_idx'),
+        ),
+        migrations.RunPython(schedule_reminders, migrations.RunPython.noop),
+    ]
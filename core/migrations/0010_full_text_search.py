@@ -0,0 +1,82 @@
+from django.db import migrations
+
+
+# The index as this migration creates it, frozen here so that later changes
+# to core.search don't alter what the migration does on a fresh database.
+# core.search.repair() reinstalls the current index at runtime.
+SCHEMA = {
+    'postgresql': [
+        "ALTER TABLE core_task ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS "
+        "(setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B')) STORED",
+        "CREATE INDEX IF NOT EXISTS core_task_search_idx ON core_task USING GIN (search_vector)",
+        "ALTER TABLE core_moodentry ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS "
+        "(setweight(to_tsvector('english', coalesce(notes, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(diet_summary, '')), 'B')) STORED",
+        "CREATE INDEX IF NOT EXISTS core_moodentry_search_idx ON core_moodentry USING GIN (search_vector)",
+    ],
+    'sqlite': [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS core_task_fts USING fts5(title, description, content='core_task', "
+        "content_rowid='id', tokenize='porter unicode61 remove_diacritics 2')",
+        "CREATE TRIGGER IF NOT EXISTS core_task_fts_insert AFTER INSERT ON core_task BEGIN "
+        "INSERT INTO core_task_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+        "CREATE TRIGGER IF NOT EXISTS core_task_fts_delete AFTER DELETE ON core_task BEGIN "
+        "INSERT INTO core_task_fts(core_task_fts, rowid, title, description) "
+        "VALUES ('delete', old.id, old.title, old.description); END",
+        "CREATE TRIGGER IF NOT EXISTS core_task_fts_update AFTER UPDATE OF title, description ON core_task BEGIN "
+        "INSERT INTO core_task_fts(core_task_fts, rowid, title, description) "
+        "VALUES ('delete', old.id, old.title, old.description); "
+        "INSERT INTO core_task_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+        "INSERT INTO core_task_fts(core_task_fts) VALUES ('rebuild')",
+        "CREATE VIRTUAL TABLE IF NOT EXISTS core_moodentry_fts USING fts5(notes, diet_summary, "
+        "content='core_moodentry', content_rowid='id', tokenize='porter unicode61 remove_diacritics 2')",
+        "CREATE TRIGGER IF NOT EXISTS core_moodentry_fts_insert AFTER INSERT ON core_moodentry BEGIN "
+        "INSERT INTO core_moodentry_fts(rowid, notes, diet_summary) VALUES (new.id, new.notes, new.diet_summary); END",
+        "CREATE TRIGGER IF NOT EXISTS core_moodentry_fts_delete AFTER DELETE ON core_moodentry BEGIN "
+        "INSERT INTO core_moodentry_fts(core_moodentry_fts, rowid, notes, diet_summary) "
+        "VALUES ('delete', old.id, old.notes, old.diet_summary); END",
+        "CREATE TRIGGER IF NOT EXISTS core_moodentry_fts_update AFTER UPDATE OF notes, diet_summary ON core_moodentry "
+        "BEGIN INSERT INTO core_moodentry_fts(core_moodentry_fts, rowid, notes, diet_summary) "
+        "VALUES ('delete', old.id, old.notes, old.diet_summary); "
+        "INSERT INTO core_moodentry_fts(rowid, notes, diet_summary) VALUES (new.id, new.notes, new.diet_summary); END",
+        "INSERT INTO core_moodentry_fts(core_moodentry_fts) VALUES ('rebuild')",
+    ],
+}
+
+DROP = {
+    'postgresql': [
+        "ALTER TABLE core_task DROP COLUMN IF EXISTS search_vector",
+        "ALTER TABLE core_moodentry DROP COLUMN IF EXISTS search_vector",
+    ],
+    'sqlite': [
+        "DROP TRIGGER IF EXISTS core_task_fts_insert",
+        "DROP TRIGGER IF EXISTS core_task_fts_delete",
+        "DROP TRIGGER IF EXISTS core_task_fts_update",
+        "DROP TABLE IF EXISTS core_task_fts",
+        "DROP TRIGGER IF EXISTS core_moodentry_fts_insert",
+        "DROP TRIGGER IF EXISTS core_moodentry_fts_delete",
+        "DROP TRIGGER IF EXISTS core_moodentry_fts_update",
+        "DROP TABLE IF EXISTS core_moodentry_fts",
+    ],
+}
+
+
+def install_search_index(apps, schema_editor):
+    for statement in SCHEMA.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement, params=None)
+
+
+def uninstall_search_index(apps, schema_editor):
+    for statement in DROP.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement, params=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_user_reminders'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 08:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_full_text_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aisummary',
+            name='fingerprint',
+            field=models.CharField(blank=True, help_text='Hash of the inputs the summary was written from.', max_length=64),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 08:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_ai_summary_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pomodorosession',
+            name='planned_duration',
+            field=models.IntegerField(blank=True, help_text='Length the timer was set to, in minutes', null=True),
+        ),
+    ]
@@ -0,0 +1,16 @@
+# Generated by Django 5.2 on 2026-10-18 08:28
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_pomodoro_planned_duration'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='SummaryJob',
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models import Q
 from django.utils import timezone
 
 
@@ -33,12 +34,28 @@ class User(AbstractUser):
         ]
     )
 
+    next_reminder_at = models.DateTimeField(null=True, blank=True, editable=False)
+
     groups = models.ManyToManyField('auth.Group', blank=True)
     user_permissions = models.ManyToManyField('auth.Permission', blank=True)
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=['next_reminder_at'], condition=Q(next_reminder_at__isnull=False), name='user_next_reminder_idx'),
+        ]
+
     def __str__(self):
         return self.username
 
+    @property
+    def current_streak(self):
+        """``streak_days`` if the streak is still alive today, else 0."""
+        if self.last_active_date is None:
+            return 0
+        if (timezone.localdate() - self.last_active_date).days > 1:
+            return 0
+        return self.streak_days
+
 
     def save(self, *args, **kwargs):
         is_new = self._state.adding
@@ -79,6 +96,10 @@ class Category(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    todo_count = models.PositiveIntegerField(default=0, help_text='Denormalized number of tasks in "To Do".')
+    in_progress_count = models.PositiveIntegerField(default=0, help_text='Denormalized number of tasks in "In Progress".')
+    completed_count = models.PositiveIntegerField(default=0, help_text='Denormalized number of completed tasks.')
+
     class Meta:
         verbose_name_plural = 'Categories'
         unique_together = ['name', 'user']
@@ -87,15 +108,21 @@ class Category(models.Model):
         return self.get_name_display()
 
     @classmethod
-    def create_default_categories(cls, user):
-        for category_name, _ in cls.CATEGORY_CHOICES:
-            cls.objects.create(
+    def default_categories_for(cls, user):
+        return [
+            cls(
                 name=category_name,
                 color=cls.DEFAULT_COLORS.get(category_name, '#95A5A6'),
                 user=user,
                 is_default=True,
                 is_active=True
             )
+            for category_name, _ in cls.CATEGORY_CHOICES
+        ]
+
+    @classmethod
+    def create_default_categories(cls, user):
+        return cls.objects.bulk_create(cls.default_categories_for(user))
 
 
 class Task(models.Model):
@@ -124,6 +151,13 @@ class Task(models.Model):
     estimated_completed_at = models.PositiveIntegerField(null=True, blank=True, help_text='Estimated time to complete in minutes')
     actual_completed_at = models.PositiveIntegerField(null=True, blank=True, help_text='Actual time spent in minutes')
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'due_date'], name='task_user_due_idx'),
+            models.Index(fields=['user', 'status'], name='task_user_status_idx'),
+            models.Index(fields=['user', 'due_date'], condition=~Q(status='completed'), name='task_user_open_due_idx'),
+        ]
+
     def __str__(self):
         return f"{self.title}"
 
@@ -139,9 +173,17 @@ class PomodoroSession(models.Model):
     start_time = models.DateTimeField()
     end_time = models.DateTimeField(null=True, blank=True)
     duration = models.IntegerField(help_text='Duration in minutes')
+    planned_duration = models.IntegerField(null=True, blank=True, help_text='Length the timer was set to, in minutes')
     completed = models.BooleanField(default=False)
     notes = models.TextField(blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'start_time'], name='pomodoro_user_start_idx'),
+            models.Index(fields=['user', '-start_time'], condition=Q(completed=True), name='pomodoro_user_done_idx'),
+            models.Index(fields=['start_time'], condition=Q(end_time__isnull=True), name='pomodoro_open_idx'),
+        ]
+
     def __str__(self):
         return f"Pomodoro Session ({self.user.username}) - {self.start_time}"
 
@@ -201,6 +243,11 @@ class MoodEntry(models.Model):
     date = models.DateField(auto_now_add=True)
     time = models.TimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-date', '-time'], name='mood_user_date_idx'),
+        ]
+
     def __str__(self):
         return f"{self.get_mood_display()} - {self.user.username} - {self.date}"
 
@@ -209,6 +256,7 @@ class AISummary(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     date = models.DateField()
     content = models.TextField()
+    fingerprint = models.CharField(max_length=64, blank=True, help_text='Hash of the inputs the summary was written from.')
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -216,3 +264,60 @@ class AISummary(models.Model):
 
     def __str__(self):
         return f"Summary for {self.user} on {self.date}"
+
+
+class PointsTransaction(models.Model):
+    KIND_TASK = 'task'
+    KIND_REWARD = 'reward'
+    KIND_ADJUSTMENT = 'adjustment'
+    KIND_ROLLUP = 'rollup'
+
+    KIND_CHOICES = [
+        (KIND_TASK, 'Task completed'),
+        (KIND_REWARD, 'Reward claimed'),
+        (KIND_ADJUSTMENT, 'Adjustment'),
+        (KIND_ROLLUP, 'Rolled-up history'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='points_transactions')
+    amount = models.IntegerField(help_text='Points added (positive) or spent (negative).')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    task = models.ForeignKey(Task, on_delete=models.SET_NULL, null=True, blank=True, related_name='points_transactions')
+    reward = models.ForeignKey(Rewards, on_delete=models.SET_NULL, null=True, blank=True, related_name='points_transactions')
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='points_user_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.amount:+d} points for {self.user} ({self.kind})"
+
+
+class DailyStats(models.Model):
+    """Per-user, per-day rollup of tasks, Pomodoros and the journal,
+    maintained incrementally by the write paths (see ``core.rollups``)."""
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='daily_stats')
+    date = models.DateField()
+    tasks_due = models.PositiveIntegerField(default=0)
+    tasks_completed = models.PositiveIntegerField(default=0, help_text='Tasks due on this day that are completed.')
+    pomodoros = models.PositiveIntegerField(default=0, help_text='Completed Pomodoro sessions started on this day.')
+    focus_minutes = models.PositiveIntegerField(default=0)
+    points_earned = models.PositiveIntegerField(default=0, help_text='Points of the tasks completed on this day.')
+    mood = models.CharField(max_length=20, choices=MoodEntry.MOOD_CHOICES, blank=True)
+    water_intake = models.PositiveIntegerField(null=True, blank=True)
+    exercised = models.BooleanField(null=True, blank=True)
+
+    class Meta:
+        verbose_name_plural = 'Daily stats'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'date'], name='dailystats_user_date_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['date'], name='dailystats_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"Stats for {self.user} on {self.date}"
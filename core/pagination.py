@@ -0,0 +1,82 @@
+import base64
+import binascii
+import json
+
+from django.db.models import Q
+
+
+PAGE_SIZE = 30
+
+
+class Page:
+    def __init__(self, items, next_cursor):
+        self.items = items
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+
+def _encode(values):
+    raw = json.dumps([value.isoformat() if hasattr(value, 'isoformat') else value for value in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def _decode(cursor, model, fields):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, ValueError):
+        return None
+    if not isinstance(values, list) or len(values) != len(fields):
+        return None
+    try:
+        return [model._meta.get_field(name).to_python(value) for name, value in zip(fields, values)]
+    except Exception:
+        return None
+
+
+def _after(fields, values):
+    """Rows strictly after ``values`` in descending ``fields`` order."""
+    condition = Q()
+    for i, name in enumerate(fields):
+        step = Q(**{f'{name}__lt': values[i]})
+        for prev_name, prev_value in zip(fields[:i], values[:i]):
+            step &= Q(**{prev_name: prev_value})
+        condition |= step
+    return condition
+
+
+def _ordered(queryset, fields, cursor):
+    queryset = queryset.order_by(*(f'-{name}' for name in fields))
+    if cursor:
+        values = _decode(cursor, queryset.model, fields)
+        if values is not None:
+            queryset = queryset.filter(_after(fields, values))
+    return queryset
+
+
+def _page(items, fields, size):
+    next_cursor = None
+    if len(items) > size:
+        items = items[:size]
+        next_cursor = _encode([getattr(items[-1], name) for name in fields])
+    return Page(items, next_cursor)
+
+
+def keyset_page(queryset, fields, cursor=None, size=PAGE_SIZE):
+    """Return one page of ``queryset`` ordered by ``fields`` descending.
+
+    Pages are addressed by an opaque cursor holding the sort key of the last
+    row, so every page is a bounded index range scan no matter how deep the
+    user pages.
+    """
+    queryset = _ordered(queryset, fields, cursor)
+    return _page(list(queryset[:size + 1]), fields, size)
+
+
+async def akeyset_page(queryset, fields, cursor=None, size=PAGE_SIZE):
+    """Async version of :func:`keyset_page`."""
+    queryset = _ordered(queryset, fields, cursor)
+    return _page([item async for item in queryset[:size + 1]], fields, size)
@@ -0,0 +1,67 @@
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.backends import invalidate_cached_users
+from core.models import PointsTransaction, Rewards, Task, User
+from core.snapshots import bump_user_version
+from core.streaks import record_activity
+
+
+class RewardAlreadyClaimed(Exception):
+    pass
+
+
+class InsufficientPoints(Exception):
+    pass
+
+
+def complete_task(task):
+    """Mark ``task`` completed and credit its points exactly once.
+
+    Returns the updated task, or ``None`` if it was already completed.
+    """
+    with transaction.atomic():
+        task = Task.objects.select_for_update().get(pk=task.pk)
+        if task.status == 'completed':
+            return None
+        task.status = 'completed'
+        task.save(update_fields=['status', 'completed_at'])
+
+        User.objects.filter(pk=task.user_id).update(
+            points=F('points') + task.points,
+            total_completed_tasks=F('total_completed_tasks') + 1,
+        )
+        invalidate_cached_users(task.user_id)
+        PointsTransaction.objects.create(
+            user_id=task.user_id, amount=task.points, kind=PointsTransaction.KIND_TASK, task=task,
+        )
+        record_activity(task.user_id)
+    return task
+
+
+def claim_reward(user, reward):
+    """Claim ``reward`` for ``user``, spending its points.
+
+    Both the claim and the debit are conditional UPDATEs, so concurrent
+    requests can neither claim the same reward twice nor overdraw the
+    balance.
+    """
+    with transaction.atomic():
+        claimed = Rewards.objects.filter(pk=reward.pk, user=user, is_claimed=False).update(
+            is_claimed=True, claimed_at=timezone.now(),
+        )
+        if not claimed:
+            raise RewardAlreadyClaimed()
+
+        paid = User.objects.filter(pk=user.pk, points__gte=reward.points).update(
+            points=F('points') - reward.points,
+        )
+        if not paid:
+            raise InsufficientPoints()
+
+        invalidate_cached_users(user.pk)
+        PointsTransaction.objects.create(
+            user=user, amount=-reward.points, kind=PointsTransaction.KIND_REWARD, reward=reward,
+        )
+    bump_user_version(user.pk)
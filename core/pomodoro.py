@@ -0,0 +1,103 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from core import rollups
+from core.backends import invalidate_cached_users
+from core.models import PomodoroSession, Task, User
+from core.snapshots import bump_user_version
+from core.streaks import record_activity
+
+
+STALE_AFTER = timedelta(hours=6)
+
+
+def focused_minutes(session, now):
+    """Minutes actually spent in ``session``, capped at the planned length
+    so a timer left running in a forgotten tab doesn't count as focus."""
+    elapsed = max(0, round((now - session.start_time).total_seconds() / 60))
+    return min(elapsed, session.duration)
+
+
+def finish_session(session, note='', now=None):
+    """Close ``session`` as completed and roll its real duration into the
+    task and user aggregates.
+
+    ``duration`` becomes the focused minutes, which is what every
+    aggregate sums; the timer's length is kept in ``planned_duration``.
+
+    The session is closed with a conditional UPDATE, so a double submit
+    (or a race with the sweeper) finalises it at most once. Returns the
+    number of focused minutes, or ``None`` if the session was already
+    closed.
+    """
+    now = now or timezone.now()
+    minutes = focused_minutes(session, now)
+    changes = {
+        'end_time': now, 'completed': True, 'duration': minutes,
+        'planned_duration': Coalesce(F('planned_duration'), F('duration')),
+    }
+    if note:
+        changes['notes'] = note
+
+    with transaction.atomic():
+        closed = PomodoroSession.objects.filter(pk=session.pk, end_time__isnull=True).update(**changes)
+        if not closed:
+            return None
+        User.objects.filter(pk=session.user_id).update(total_pomodoro_sessions=F('total_pomodoro_sessions') + 1)
+        invalidate_cached_users(session.user_id)
+        if session.task_id:
+            Task.objects.filter(pk=session.task_id).update(
+                actual_completed_at=Coalesce(F('actual_completed_at'), Value(0)) + minutes,
+            )
+        rollups.adjust(session.user_id, timezone.localdate(session.start_time), pomodoros=1, focus_minutes=minutes)
+        record_activity(session.user_id, timezone.localdate(now))
+    bump_user_version(session.user_id)
+    return minutes
+
+
+def stale_sessions(now=None, older_than=STALE_AFTER):
+    """Open sessions started more than ``older_than`` ago. Served by the
+    partial ``pomodoro_open_idx`` index, which only holds open sessions."""
+    now = now or timezone.now()
+    return PomodoroSession.objects.filter(end_time__isnull=True, start_time__lt=now - older_than)
+
+
+def sweep_stale_sessions(now=None, older_than=STALE_AFTER, discard=False):
+    """Close (or with ``discard`` delete) abandoned sessions.
+
+    Closed sessions are marked not completed, so they never count towards
+    any aggregate. Returns ``(swept, user_ids)``.
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        stale = stale_sessions(now, older_than)
+        user_ids = set(stale.values_list('user_id', flat=True).distinct())
+        if discard:
+            swept, _ = stale.delete()
+        else:
+            swept = stale.update(end_time=now, completed=False)
+    for user_id in user_ids:
+        bump_user_version(user_id)
+    return swept, user_ids
+
+
+def rebuild_totals(users=None):
+    """Recompute ``User.total_pomodoro_sessions`` and
+    ``Task.actual_completed_at`` from the completed sessions."""
+    users = users if users is not None else User.objects.all()
+    sessions = PomodoroSession.objects.filter(completed=True).order_by()
+    per_user = sessions.filter(user=OuterRef('pk')).values('user').annotate(total=Count('pk')).values('total')
+    per_task = sessions.filter(task=OuterRef('pk')).values('task').annotate(total=Sum('duration')).values('total')
+
+    updated = users.update(
+        total_pomodoro_sessions=Coalesce(Subquery(per_user, output_field=IntegerField()), Value(0)),
+    )
+    invalidate_cached_users(*users.values_list('pk', flat=True))
+    Task.objects.filter(user__in=users).update(
+        actual_completed_at=Coalesce(Subquery(per_task, output_field=IntegerField()), Value(0)),
+    )
+    return updated
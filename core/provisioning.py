@@ -0,0 +1,45 @@
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import BaseUserManager
+from django.db import transaction
+
+from core import reminders
+from core.models import Category, User
+
+
+def create_users(rows, default_password=None, hasher=map):
+    """Insert users described by ``rows`` (dicts with at least ``username``)
+    together with their default categories, in a handful of bulk queries.
+
+    Existing usernames are skipped. ``hasher`` is a ``map``-like callable,
+    e.g. ``ThreadPoolExecutor.map``, used to hash the passwords in parallel.
+    Rows without a password get ``default_password``, or an unusable
+    password when that is ``None``. Returns ``(created_users, skipped)``.
+    """
+    by_username = {}
+    for row in rows:
+        by_username[User.normalize_username(row['username'].strip())] = row
+    existing = set(User.objects.filter(username__in=by_username).values_list('username', flat=True))
+    new_rows = [(username, row) for username, row in by_username.items() if username not in existing]
+
+    hashes = list(hasher(make_password, [row.get('password') or default_password for _, row in new_rows]))
+    users = [
+        User(
+            username=username,
+            email=BaseUserManager.normalize_email(row.get('email') or ''),
+            first_name=row.get('first_name') or '',
+            last_name=row.get('last_name') or '',
+            password=password_hash,
+        )
+        for (username, row), password_hash in zip(new_rows, hashes)
+    ]
+    # bulk_create skips User.save() and its signals, so the default
+    # categories are inserted in bulk below and reminders scheduled here.
+    for user in users:
+        reminders.reschedule(user)
+    with transaction.atomic():
+        User.objects.bulk_create(users)
+        Category.objects.bulk_create(
+            [category for user in users for category in Category.default_categories_for(user)],
+            batch_size=1000,
+        )
+    return users, len(rows) - len(users)
@@ -0,0 +1,131 @@
+import random
+from datetime import time, timedelta
+
+from django.conf import settings
+from django.core.mail import get_connection, send_mass_mail
+from django.db import transaction
+from django.db.models import Min
+from django.utils import timezone
+
+from core.backends import invalidate_cached_users
+from core.models import User
+
+
+INTERVALS = {
+    '15min': timedelta(minutes=15),
+    '30min': timedelta(minutes=30),
+    'hourly': timedelta(hours=1),
+    'daily': timedelta(days=1),
+}
+REMINDER_FIELDS = (
+    'enable_notifications', 'reminder_frequency', 'email', 'is_active',
+    'preferred_working_hours_start', 'preferred_working_hours_end',
+)
+BATCH_SIZE = 100
+# Used when a user hasn't set working hours, so nobody is emailed at night.
+DEFAULT_WORKING_HOURS = (time(9), time(17))
+
+SUBJECT = 'A gentle reminder from NeuroZen'
+MESSAGES = [
+    "💧 Time to hydrate!",
+    "🌿 Take a deep breath and reset.",
+    "🧘 Stretch your body – even 30 seconds helps.",
+    "📓 Reflect: What’s one small win from today?",
+    "☀️ Step away from the screen for 1 minute.",
+    "🧡 You’re doing great. Keep going!",
+]
+
+
+def wants_reminders(user):
+    return bool(user.enable_notifications and user.email and user.is_active)
+
+
+def working_hours(user):
+    start, end = user.preferred_working_hours_start, user.preferred_working_hours_end
+    if start is None or end is None:
+        return DEFAULT_WORKING_HOURS
+    return start, end
+
+
+def in_working_hours(user, moment):
+    start, end = working_hours(user)
+    if start == end:
+        return True
+    now = timezone.localtime(moment).time()
+    if start < end:
+        return start <= now < end
+    return now >= start or now < end  # window wraps past midnight
+
+
+def _next_window_start(user, moment):
+    local = timezone.localtime(moment)
+    window_start, _ = working_hours(user)
+    start = local.replace(hour=window_start.hour, minute=window_start.minute, second=0, microsecond=0)
+    return start if start > local else start + timedelta(days=1)
+
+
+def next_fire_time(user, after):
+    """First reminder time after ``after``: one interval later, moved to
+    the start of the user's working hours if it would fall outside them."""
+    if not wants_reminders(user):
+        return None
+    candidate = after + INTERVALS.get(user.reminder_frequency, INTERVALS['hourly'])
+    if in_working_hours(user, candidate):
+        return candidate
+    return _next_window_start(user, candidate)
+
+
+def reschedule(user, now=None):
+    """Recompute ``user.next_reminder_at`` in memory (the caller saves)."""
+    user.next_reminder_at = next_fire_time(user, now or timezone.now())
+    return user.next_reminder_at
+
+
+def next_due_at():
+    """When the earliest scheduled reminder fires, or ``None``."""
+    return User.objects.filter(next_reminder_at__isnull=False).aggregate(due=Min('next_reminder_at'))['due']
+
+
+def claim_due(now, limit=BATCH_SIZE):
+    """Lock up to ``limit`` due users, move their schedule forward and
+    return them. Skips rows another worker holds, so several workers can
+    drain the queue together; a reminder is sent at most once."""
+    with transaction.atomic():
+        users = list(
+            User.objects.select_for_update(skip_locked=True)
+            .filter(next_reminder_at__lte=now)
+            .order_by('next_reminder_at')[:limit]
+        )
+        for user in users:
+            reschedule(user, now)
+        User.objects.bulk_update(users, ['next_reminder_at'])
+        invalidate_cached_users(*(user.pk for user in users))
+    return users
+
+
+def build_message(user):
+    name = user.first_name or user.username
+    body = f"Hi {name},\n\n{random.choice(MESSAGES)}\n\n— NeuroZen"
+    return SUBJECT, body, settings.DEFAULT_FROM_EMAIL, [user.email]
+
+
+def send_due_reminders(now=None, batch_size=BATCH_SIZE, connection=None):
+    """Send every due reminder in batches over one mail connection.
+
+    Users whose reminder falls outside their working hours are only
+    rescheduled. Returns the number of emails sent.
+    """
+    now = now or timezone.now()
+    connection = connection or get_connection()
+    sent = 0
+    with connection:
+        while True:
+            users = claim_due(now, batch_size)
+            if not users:
+                break
+            batch = [build_message(user) for user in users if wants_reminders(user) and in_working_hours(user, now)]
+            if batch:
+                sent += send_mass_mail(batch, connection=connection)
+            if len(users) < batch_size:
+                break
+    return sent
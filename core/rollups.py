@@ -0,0 +1,142 @@
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Greatest, TruncDate
+from django.utils import timezone
+
+from core.dates import day_range
+from core.models import DailyStats, MoodEntry, PomodoroSession, Task
+
+
+def _local_day(value):
+    return timezone.localdate(value) if value is not None else None
+
+
+def task_contribution(user_id, due_date, status, completed_at, points):
+    """``{(user_id, day): {field: amount}}`` that one task adds to the rollups."""
+    contribution = {}
+    due_day = _local_day(due_date)
+    if due_day is not None:
+        contribution[(user_id, due_day)] = {'tasks_due': 1, 'tasks_completed': int(status == 'completed')}
+    done_day = _local_day(completed_at)
+    if status == 'completed' and done_day is not None and points:
+        contribution.setdefault((user_id, done_day), {})['points_earned'] = points
+    return contribution
+
+
+def session_contribution(user_id, start_time, completed, duration):
+    """``{(user_id, day): {field: amount}}`` that one Pomodoro session adds."""
+    if not completed or start_time is None:
+        return {}
+    return {(user_id, _local_day(start_time)): {'pomodoros': 1, 'focus_minutes': duration or 0}}
+
+
+def adjust(user_id, day, **deltas):
+    """Add ``deltas`` to the counters of ``user_id`` on ``day`` in one UPDATE,
+    creating the row first when a counter has to go up."""
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    changes = {field: Greatest(F(field) + delta, 0) for field, delta in deltas.items()}
+    rows = DailyStats.objects.filter(user_id=user_id, date=day)
+    if not rows.update(**changes) and any(delta > 0 for delta in deltas.values()):
+        DailyStats.objects.get_or_create(user_id=user_id, date=day)
+        rows.update(**changes)
+
+
+def apply_change(previous, current):
+    """Move the rollups from the ``previous`` to the ``current`` contribution
+    of a row, touching only the days whose counters actually change."""
+    for key in previous.keys() | current.keys():
+        before, after = previous.get(key, {}), current.get(key, {})
+        deltas = {field: after.get(field, 0) - before.get(field, 0) for field in before.keys() | after.keys()}
+        adjust(*key, **deltas)
+
+
+def add_contributions(contributions):
+    """Apply the summed ``contributions`` of freshly inserted rows, one
+    UPDATE per touched day."""
+    totals = {}
+    for contribution in contributions:
+        for key, amounts in contribution.items():
+            day_totals = totals.setdefault(key, {})
+            for field, amount in amounts.items():
+                day_totals[field] = day_totals.get(field, 0) + amount
+    for key, amounts in totals.items():
+        adjust(*key, **amounts)
+
+
+def refresh_mood(user_id, day):
+    """Copy the latest journal entry of ``day`` into the rollup row."""
+    entry = (MoodEntry.objects.filter(user_id=user_id, date=day).order_by('-time')
+             .values('mood', 'water_intake', 'exercised').first())
+    if entry is None:
+        DailyStats.objects.filter(user_id=user_id, date=day).update(mood='', water_intake=None, exercised=None)
+    else:
+        DailyStats.objects.update_or_create(user_id=user_id, date=day, defaults=entry)
+
+
+def stats_for(user_id, day):
+    """The rollup row of ``day``, or an unsaved empty one."""
+    return DailyStats.objects.filter(user_id=user_id, date=day).first() or DailyStats(user_id=user_id, date=day)
+
+
+def stats_range(user_id, start, end):
+    """Rollup rows of the inclusive ``[start, end]`` date range, oldest first."""
+    return DailyStats.objects.filter(user_id=user_id, date__gte=start, date__lte=end).order_by('date')
+
+
+def rebuild(user_ids=None, start=None, end=None):
+    """Recompute the rollups from the raw tables with one grouped query per
+    source. ``start``/``end`` limit the rebuild to an inclusive date range.
+
+    Returns the number of rows written.
+    """
+    tasks_due = Task.objects.filter(due_date__isnull=False)
+    tasks_done = Task.objects.filter(status='completed', completed_at__isnull=False, points__gt=0)
+    sessions = PomodoroSession.objects.filter(completed=True)
+    moods = MoodEntry.objects.all()
+    existing = DailyStats.objects.all()
+    if user_ids is not None:
+        tasks_due, tasks_done, sessions, moods, existing = (
+            queryset.filter(user_id__in=user_ids) for queryset in (tasks_due, tasks_done, sessions, moods, existing)
+        )
+    if start is not None:
+        since, _ = day_range(start)
+        tasks_due = tasks_due.filter(due_date__gte=since)
+        tasks_done = tasks_done.filter(completed_at__gte=since)
+        sessions = sessions.filter(start_time__gte=since)
+        moods, existing = moods.filter(date__gte=start), existing.filter(date__gte=start)
+    if end is not None:
+        _, until = day_range(end)
+        tasks_due = tasks_due.filter(due_date__lt=until)
+        tasks_done = tasks_done.filter(completed_at__lt=until)
+        sessions = sessions.filter(start_time__lt=until)
+        moods, existing = moods.filter(date__lte=end), existing.filter(date__lte=end)
+
+    rows = {}
+
+    def row(user_id, day):
+        if (user_id, day) not in rows:
+            rows[(user_id, day)] = DailyStats(user_id=user_id, date=day)
+        return rows[(user_id, day)]
+
+    for item in (tasks_due.annotate(day=TruncDate('due_date')).values('user', 'day')
+                 .annotate(due=Count('pk'), completed=Count('pk', filter=Q(status='completed'))).order_by()):
+        stats = row(item['user'], item['day'])
+        stats.tasks_due, stats.tasks_completed = item['due'], item['completed']
+    for item in (tasks_done.annotate(day=TruncDate('completed_at')).values('user', 'day')
+                 .annotate(points=Sum('points')).order_by()):
+        row(item['user'], item['day']).points_earned = item['points']
+    for item in (sessions.annotate(day=TruncDate('start_time')).values('user', 'day')
+                 .annotate(count=Count('pk'), minutes=Sum('duration')).order_by()):
+        stats = row(item['user'], item['day'])
+        stats.pomodoros, stats.focus_minutes = item['count'], item['minutes'] or 0
+    for user_id, day, mood, water, exercised in (moods.order_by('user', 'date', 'time')
+                                                 .values_list('user', 'date', 'mood', 'water_intake', 'exercised')):
+        stats = row(user_id, day)
+        stats.mood, stats.water_intake, stats.exercised = mood, water, exercised
+
+    with transaction.atomic():
+        existing.delete()
+        DailyStats.objects.bulk_create(rows.values(), batch_size=1000)
+    return len(rows)
@@ -0,0 +1,223 @@
+"""Full-text search over task titles/descriptions and journal notes.
+
+The index lives next to the tables and is maintained by the database
+itself, so every write path (forms, the API, bulk imports) keeps it
+current:
+
+* PostgreSQL: a generated ``search_vector tsvector`` column on each table
+  with a GIN index; results are ranked with ``ts_rank`` and highlighted
+  with ``ts_headline``.
+* SQLite (tests, local development): external-content FTS5 tables kept in
+  sync by triggers; results are ranked with ``bm25`` and highlighted with
+  ``snippet``/``highlight``.
+
+SQLite drops a table's triggers when a migration rebuilds it; a
+``post_migrate`` handler calls :func:`repair` to put them back, and
+``manage.py rebuild_search_index`` does the same by hand.
+"""
+import re
+
+from django.db import connection
+from django.utils.html import escape
+
+from core.models import MoodEntry, Task
+
+
+SEARCH_CONFIG = 'english'
+MAX_RESULTS = 50
+MARK_START, MARK_END = '\x02', '\x03'
+ELLIPSIS = '…'
+
+# Indexed columns of each result type. The title column is weighted above
+# the body columns, so title matches rank first.
+DOCUMENTS = {
+    'task': {'table': 'core_task', 'title': 'title', 'body': ['description']},
+    'journal': {'table': 'core_moodentry', 'title': None, 'body': ['notes', 'diet_summary']},
+}
+MODELS = {'task': Task, 'journal': MoodEntry}
+
+
+class SearchUnavailable(Exception):
+    pass
+
+
+def _columns(document):
+    return ([document['title']] if document['title'] else []) + document['body']
+
+
+def _postgres_schema():
+    statements = []
+    for document in DOCUMENTS.values():
+        table = document['table']
+        vector = ' || '.join(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({column}, '')), "
+            f"'{'A' if column == document['title'] else 'B'}')"
+            for column in _columns(document)
+        )
+        statements += [
+            f'ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector '
+            f'GENERATED ALWAYS AS ({vector}) STORED',
+            f'CREATE INDEX IF NOT EXISTS {table}_search_idx ON {table} USING GIN (search_vector)',
+        ]
+    return statements
+
+
+def _sqlite_schema():
+    statements = []
+    for document in DOCUMENTS.values():
+        table, columns = document['table'], _columns(document)
+        names = ', '.join(columns)
+        new = ', '.join(f'new.{column}' for column in columns)
+        old = ', '.join(f'old.{column}' for column in columns)
+        delete = f"INSERT INTO {table}_fts({table}_fts, rowid, {names}) VALUES ('delete', old.id, {old});"
+        insert = f'INSERT INTO {table}_fts(rowid, {names}) VALUES (new.id, {new});'
+        statements += [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {table}_fts USING fts5({names}, content='{table}', "
+            f"content_rowid='id', tokenize='porter unicode61 remove_diacritics 2')",
+            f'CREATE TRIGGER IF NOT EXISTS {table}_fts_insert AFTER INSERT ON {table} BEGIN {insert} END',
+            f'CREATE TRIGGER IF NOT EXISTS {table}_fts_delete AFTER DELETE ON {table} BEGIN {delete} END',
+            f'CREATE TRIGGER IF NOT EXISTS {table}_fts_update AFTER UPDATE OF {names} ON {table} '
+            f'BEGIN {delete} {insert} END',
+            f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')",
+        ]
+    return statements
+
+
+def _sqlite_drop():
+    statements = []
+    for document in DOCUMENTS.values():
+        table = document['table']
+        statements += [f'DROP TRIGGER IF EXISTS {table}_fts_{event}' for event in ('insert', 'delete', 'update')]
+        statements.append(f'DROP TABLE IF EXISTS {table}_fts')
+    return statements
+
+
+def _postgres_drop():
+    return [f"ALTER TABLE {document['table']} DROP COLUMN IF EXISTS search_vector" for document in DOCUMENTS.values()]
+
+
+def install(schema_editor):
+    """Create (or repair) the search index on the connection's database.
+    Idempotent; also repopulates the SQLite FTS tables."""
+    vendor = schema_editor.connection.vendor
+    statements = {'postgresql': _postgres_schema, 'sqlite': _sqlite_schema}.get(vendor, list)()
+    for statement in statements:
+        schema_editor.execute(statement, params=None)
+
+
+def _sqlite_missing_triggers(connection):
+    expected = {f"{document['table']}_fts_{event}" for document in DOCUMENTS.values()
+                for event in ('insert', 'delete', 'update')}
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        return expected - {name for name, in cursor.fetchall()}
+
+
+def repair(connection):
+    """Reinstall the SQLite index if a migration dropped any of its
+    triggers. Returns whether it had to."""
+    if connection.vendor != 'sqlite' or not _sqlite_missing_triggers(connection):
+        return False
+    with connection.schema_editor() as schema_editor:
+        install(schema_editor)
+    return True
+
+
+def uninstall(schema_editor):
+    vendor = schema_editor.connection.vendor
+    statements = {'postgresql': _postgres_drop, 'sqlite': _sqlite_drop}.get(vendor, list)()
+    for statement in statements:
+        schema_editor.execute(statement, params=None)
+
+
+def render_highlight(text):
+    """HTML-escape ``text`` and turn the match markers into ``<mark>``."""
+    return escape(text or '').replace(MARK_START, '<mark>').replace(MARK_END, '</mark>')
+
+
+def _postgres_hits(user_id, query, limit):
+    highlight = f'StartSel="{MARK_START}", StopSel="{MARK_END}"'
+    fragments = f'{highlight}, MaxWords=30, MinWords=10, MaxFragments=2, FragmentDelimiter=" {ELLIPSIS} "'
+    selects, params = [], [SEARCH_CONFIG, query]
+    for kind, document in DOCUMENTS.items():
+        title = document['title'] or "''"
+        body = "concat_ws(' ', %s)" % ', '.join(document['body'])
+        selects.append(
+            f"SELECT %s AS kind, d.id, {title} AS title, {body} AS body, ts_rank(d.search_vector, q.query) AS rank "
+            f"FROM {document['table']} d, q WHERE d.user_id = %s AND d.search_vector @@ q.query"
+        )
+        params += [kind, user_id]
+    # ts_headline re-parses the text, so only run it on the rows returned.
+    sql = f"""
+        WITH q AS (SELECT websearch_to_tsquery(%s::regconfig, %s) AS query),
+        hits AS ({' UNION ALL '.join(selects)} ORDER BY rank DESC, id DESC LIMIT %s)
+        SELECT kind, id, rank,
+               ts_headline(%s::regconfig, title, q.query, %s),
+               ts_headline(%s::regconfig, body, q.query, %s)
+        FROM hits, q
+        ORDER BY rank DESC, id DESC
+    """
+    params += [limit, SEARCH_CONFIG, f'{highlight}, HighlightAll=true', SEARCH_CONFIG, fragments]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def _fts5_query(query):
+    # Quote every word so user input can't hit FTS5 query syntax; the
+    # trailing * makes each word a prefix match, like a search-as-you-type box.
+    return ' '.join(f'"{term}"*' for term in re.findall(r'\w+', query))
+
+
+def _sqlite_hits(user_id, query, limit):
+    match = _fts5_query(query)
+    if not match:
+        return []
+    selects, params = [], []
+    for kind, document in DOCUMENTS.items():
+        table = document['table']
+        fts = f'{table}_fts'
+        if document['title']:
+            title = f"highlight({fts}, 0, '{MARK_START}', '{MARK_END}')"
+            body = f"snippet({fts}, 1, '{MARK_START}', '{MARK_END}', '{ELLIPSIS}', 24)"
+            weights = ', ' + ', '.join(['4.0'] + ['1.0'] * len(document['body']))
+        else:
+            title, weights = "''", ''
+            body = f"snippet({fts}, -1, '{MARK_START}', '{MARK_END}', '{ELLIPSIS}', 24)"
+        # bm25() is lower for better matches; negate it so rank sorts like ts_rank.
+        selects.append(
+            f"SELECT %s AS kind, d.id AS id, -bm25({fts}{weights}) AS rank, {title} AS title, {body} AS body "
+            f"FROM {fts} JOIN {table} d ON d.id = {fts}.rowid WHERE {fts} MATCH %s AND d.user_id = %s"
+        )
+        params += [kind, match, user_id]
+    sql = f"{' UNION ALL '.join(selects)} ORDER BY rank DESC, id DESC LIMIT %s"
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params + [limit])
+        return cursor.fetchall()
+
+
+def search(user_id, query, limit=MAX_RESULTS):
+    """Best matches of ``query`` among the user's tasks and journal entries.
+
+    Returns ``[(kind, obj, rank, title_html, snippet_html)]``, best first;
+    the highlights are escaped HTML with matches wrapped in ``<mark>``.
+    """
+    query = (query or '').strip()
+    if not query:
+        return []
+    if connection.vendor == 'postgresql':
+        hits = _postgres_hits(user_id, query, limit)
+    elif connection.vendor == 'sqlite':
+        hits = _sqlite_hits(user_id, query, limit)
+    else:
+        raise SearchUnavailable(f'Full-text search is not available on {connection.vendor}.')
+
+    objects = {
+        kind: model.objects.in_bulk([pk for hit_kind, pk, *_ in hits if hit_kind == kind])
+        for kind, model in MODELS.items()
+    }
+    return [
+        (kind, objects[kind][pk], rank, render_highlight(title), render_highlight(snippet))
+        for kind, pk, rank, title, snippet in hits
+        if pk in objects[kind]
+    ]
@@ -0,0 +1,164 @@
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.migrations.recorder import MigrationRecorder
+from django.db.models.signals import post_delete, post_init, post_migrate, post_save, pre_save
+from django.dispatch import receiver
+
+from core import counters, reminders, rollups, search
+from core.backends import invalidate_cached_users
+from core.catalog import invalidate_catalog
+from core.metrics import install_query_hook
+from core.models import BreathingExercise, Category, DailyQuote, MoodEntry, PomodoroSession, Rewards, Task, User
+from core.snapshots import bump_user_version
+
+
+connection_created.connect(install_query_hook, dispatch_uid='core.metrics.install_query_hook')
+
+SEARCH_MIGRATION = ('core', '0010_full_text_search')
+
+
+@receiver(post_migrate)
+def repair_search_index(sender, app_config, using, **kwargs):
+    # A later migration that rebuilds core_task or core_moodentry on SQLite
+    # drops the FTS triggers with the old table.
+    connection = connections[using]
+    if app_config.label == 'core' and SEARCH_MIGRATION in MigrationRecorder(connection).applied_migrations():
+        search.repair(connection)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+@receiver(post_save, sender=PomodoroSession)
+@receiver(post_delete, sender=PomodoroSession)
+@receiver(post_save, sender=MoodEntry)
+@receiver(post_delete, sender=MoodEntry)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Rewards)
+@receiver(post_delete, sender=Rewards)
+def invalidate_user_snapshot(sender, instance, **kwargs):
+    bump_user_version(instance.user_id)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    invalidate_cached_users(instance.pk)
+
+
+def _reminder_settings(user):
+    return tuple(user.__dict__.get(name) for name in reminders.REMINDER_FIELDS)
+
+
+@receiver(post_init, sender=User)
+def remember_reminder_settings(sender, instance, **kwargs):
+    instance._reminder_settings = None if instance.pk is None else _reminder_settings(instance)
+
+
+@receiver(pre_save, sender=User)
+def schedule_reminders(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and 'next_reminder_at' not in update_fields:
+        return
+    current = _reminder_settings(instance)
+    if current != getattr(instance, '_reminder_settings', None):
+        reminders.reschedule(instance)
+        instance._reminder_settings = current
+
+
+@receiver(post_save, sender=DailyQuote)
+@receiver(post_delete, sender=DailyQuote)
+@receiver(post_save, sender=BreathingExercise)
+@receiver(post_delete, sender=BreathingExercise)
+def refresh_content_catalog(sender, **kwargs):
+    invalidate_catalog()
+
+
+@receiver(post_init, sender=Task)
+def remember_task_counter_state(sender, instance, **kwargs):
+    if instance.pk is None:
+        instance._counted = None
+    else:
+        instance._counted = (instance.__dict__.get('category_id'), instance.__dict__.get('status'))
+
+
+@receiver(post_save, sender=Task)
+def update_category_counters_on_save(sender, instance, created, **kwargs):
+    current = (instance.category_id, instance.status)
+    previous = None if created else getattr(instance, '_counted', None)
+    if previous == current:
+        return
+    deltas = {current: 1}
+    if previous is not None:
+        deltas[previous] = deltas.get(previous, 0) - 1
+    counters.adjust_many(deltas)
+    instance._counted = current
+
+
+@receiver(post_delete, sender=Task)
+def update_category_counters_on_delete(sender, instance, **kwargs):
+    category_id, status = getattr(instance, '_counted', None) or (instance.category_id, instance.status)
+    counters.adjust(category_id, status, -1)
+
+
+def _task_contribution(task):
+    return rollups.task_contribution(task.user_id, task.due_date, task.status, task.completed_at, task.points)
+
+
+def _session_contribution(session):
+    return rollups.session_contribution(session.user_id, session.start_time, session.completed, session.duration)
+
+
+@receiver(post_init, sender=Task)
+def remember_task_rollup_state(sender, instance, **kwargs):
+    fields = ('user_id', 'due_date', 'status', 'completed_at', 'points')
+    if instance.pk is None or any(name not in instance.__dict__ for name in fields):
+        instance._rolled_up = None
+    else:
+        instance._rolled_up = _task_contribution(instance)
+
+
+@receiver(post_save, sender=Task)
+def update_daily_stats_on_task_save(sender, instance, created, **kwargs):
+    current = _task_contribution(instance)
+    previous = {} if created else getattr(instance, '_rolled_up', None)
+    if previous is None:
+        return
+    rollups.apply_change(previous, current)
+    instance._rolled_up = current
+
+
+@receiver(post_delete, sender=Task)
+def update_daily_stats_on_task_delete(sender, instance, **kwargs):
+    previous = getattr(instance, '_rolled_up', None)
+    rollups.apply_change(_task_contribution(instance) if previous is None else previous, {})
+
+
+@receiver(post_init, sender=PomodoroSession)
+def remember_session_rollup_state(sender, instance, **kwargs):
+    fields = ('user_id', 'start_time', 'completed', 'duration')
+    if instance.pk is None or any(name not in instance.__dict__ for name in fields):
+        instance._rolled_up = None
+    else:
+        instance._rolled_up = _session_contribution(instance)
+
+
+@receiver(post_save, sender=PomodoroSession)
+def update_daily_stats_on_session_save(sender, instance, created, **kwargs):
+    current = _session_contribution(instance)
+    previous = {} if created else getattr(instance, '_rolled_up', None)
+    if previous is None:
+        return
+    rollups.apply_change(previous, current)
+    instance._rolled_up = current
+
+
+@receiver(post_delete, sender=PomodoroSession)
+def update_daily_stats_on_session_delete(sender, instance, **kwargs):
+    previous = getattr(instance, '_rolled_up', None)
+    rollups.apply_change(_session_contribution(instance) if previous is None else previous, {})
+
+
+@receiver(post_save, sender=MoodEntry)
+@receiver(post_delete, sender=MoodEntry)
+def update_daily_stats_mood(sender, instance, **kwargs):
+    rollups.refresh_mood(instance.user_id, instance.date)
@@ -0,0 +1,114 @@
+import time
+
+from django.core.cache import cache
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from core.dates import day_range
+from core.models import Category, DailyStats, MoodEntry, Task, User
+
+
+SNAPSHOT_SCHEMA = 1
+SNAPSHOT_TIMEOUT = 60 * 60
+VERSION_TIMEOUT = None
+
+
+def _version_key(user_id):
+    return f'user-version:{user_id}'
+
+
+def _new_version():
+    # A timestamp rather than a counter: a version key that expired or was
+    # evicted then comes back as a value no earlier snapshot or ETag used.
+    return time.time_ns()
+
+
+def get_user_version(user_id):
+    version = cache.get(_version_key(user_id))
+    if version is None:
+        version = _new_version()
+        cache.add(_version_key(user_id), version, VERSION_TIMEOUT)
+    return version
+
+
+async def aget_user_version(user_id):
+    version = await cache.aget(_version_key(user_id))
+    if version is None:
+        version = _new_version()
+        await cache.aadd(_version_key(user_id), version, VERSION_TIMEOUT)
+    return version
+
+
+def bump_user_version(user_id):
+    """Invalidate everything cached under the user's current version."""
+    version = _new_version()
+    # Written with set() and an explicit timeout: incr() on some backends
+    # rewrites the key with the default (5 minute) TIMEOUT.
+    cache.set(_version_key(user_id), version, VERSION_TIMEOUT)
+    return version
+
+
+def _snapshot_key(user_id, version, day):
+    return f'dashboard:{SNAPSHOT_SCHEMA}:{user_id}:{version}:{day.isoformat()}'
+
+
+def _count(queryset, by='user'):
+    counted = queryset.order_by().values(by).annotate(total=Count('pk')).values('total')
+    return Coalesce(Subquery(counted, output_field=IntegerField()), 0)
+
+
+def _stat(stats, field):
+    return Coalesce(Subquery(stats.values(field)[:1], output_field=IntegerField()), 0)
+
+
+def dashboard_counts_queryset(user, today):
+    stats = DailyStats.objects.filter(user=OuterRef('pk'), date=today)
+    return User.objects.filter(pk=user.pk).annotate(
+        today_tasks_count=_stat(stats, 'tasks_due'),
+        completed_today_count=_stat(stats, 'tasks_completed'),
+        pending_tasks_count=_count(
+            Task.objects.filter(category__user=OuterRef('pk')).exclude(status='completed'), by='category__user',
+        ),
+        pomodoro_today=_stat(stats, 'pomodoros'),
+    ).values('today_tasks_count', 'completed_today_count', 'pending_tasks_count', 'pomodoro_today')
+
+
+def today_tasks_queryset(user, today):
+    start, end = day_range(today)
+    return Task.objects.filter(user=user, due_date__gte=start, due_date__lt=end).order_by('priority', 'due_date')
+
+
+def compute_dashboard_snapshot(user, today):
+    return {
+        **dashboard_counts_queryset(user, today).get(),
+        'today_tasks': list(today_tasks_queryset(user, today)[:5]),
+        'mood_entry': MoodEntry.objects.filter(user=user, date=today).order_by('-time').first(),
+        'categories': list(Category.objects.filter(user=user, is_active=True)),
+    }
+
+
+async def acompute_dashboard_snapshot(user, today):
+    return {
+        **await dashboard_counts_queryset(user, today).aget(),
+        'today_tasks': [task async for task in today_tasks_queryset(user, today)[:5]],
+        'mood_entry': await MoodEntry.objects.filter(user=user, date=today).order_by('-time').afirst(),
+        'categories': [category async for category in Category.objects.filter(user=user, is_active=True)],
+    }
+
+
+def get_dashboard_snapshot(user, today):
+    key = _snapshot_key(user.pk, get_user_version(user.pk), today)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = compute_dashboard_snapshot(user, today)
+        cache.set(key, snapshot, SNAPSHOT_TIMEOUT)
+    return snapshot
+
+
+async def aget_dashboard_snapshot(user, today):
+    key = _snapshot_key(user.pk, await aget_user_version(user.pk), today)
+    snapshot = await cache.aget(key)
+    if snapshot is None:
+        snapshot = await acompute_dashboard_snapshot(user, today)
+        await cache.aset(key, snapshot, SNAPSHOT_TIMEOUT)
+    return snapshot
@@ -0,0 +1,77 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.db.models import Case, F, Q, Value, When
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from core.backends import invalidate_cached_users
+from core.models import MoodEntry, PomodoroSession, Task, User
+
+
+def record_activity(user_id, day=None):
+    """Advance the user's streak for activity on ``day`` in one UPDATE.
+
+    Activity on the day after ``last_active_date`` extends the streak, a
+    later day restarts it at 1, and repeated activity on the same (or an
+    earlier) day is a no-op.
+    """
+    day = day or timezone.localdate()
+    updated = User.objects.filter(
+        Q(last_active_date__isnull=True) | Q(last_active_date__lt=day), pk=user_id,
+    ).update(
+        streak_days=Case(
+            When(last_active_date=day - timedelta(days=1), then=F('streak_days') + 1),
+            default=Value(1),
+        ),
+        last_active_date=day,
+    )
+    if updated:
+        invalidate_cached_users(user_id)
+    return updated
+
+
+def activity_days_sql(user_ids=None):
+    """SQL and params selecting distinct ``(user_id, day)`` activity rows."""
+    sources = [
+        Task.objects.filter(completed_at__isnull=False).annotate(day=TruncDate('completed_at')),
+        PomodoroSession.objects.filter(completed=True).annotate(day=TruncDate('start_time')),
+        MoodEntry.objects.annotate(day=F('date')),
+    ]
+    if user_ids is not None:
+        sources = [queryset.filter(user_id__in=user_ids) for queryset in sources]
+    first, *rest = [queryset.order_by().values_list('user_id', 'day') for queryset in sources]
+    return first.union(*rest).query.sql_with_params()
+
+
+def _day_number(column):
+    if connection.vendor == 'postgresql':
+        return f"({column} - DATE '2000-01-01')"
+    return f"CAST(julianday({column}) AS INTEGER)"
+
+
+def current_runs(user_ids=None):
+    """Yield ``(user_id, last_active_date, streak_days)`` for the most
+    recent run of consecutive active days of every user, computed in one
+    gaps-and-islands query."""
+    activity_sql, params = activity_days_sql(user_ids)
+    sql = f"""
+        WITH activity (user_id, day) AS ({activity_sql}),
+        islands AS (
+            SELECT user_id, day,
+                   {_day_number('day')} - ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY day) AS island
+            FROM activity
+        ),
+        runs AS (
+            SELECT user_id, MAX(day) AS last_day, COUNT(*) AS length,
+                   ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY MAX(day) DESC) AS recency
+            FROM islands
+            GROUP BY user_id, island
+        )
+        SELECT user_id, last_day, length FROM runs WHERE recency = 1
+    """
+    date_field = MoodEntry._meta.get_field('date')
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        for user_id, last_day, length in cursor:
+            yield user_id, date_field.to_python(last_day), length
@@ -0,0 +1,265 @@
+import hashlib
+import json
+import re
+from dataclasses import dataclass, field
+from datetime import date
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q, Sum
+
+from core.dates import day_range
+from core.llm import acached_stream, cached_complete, cached_stream
+from core.models import AISummary, DailyStats, MoodEntry, PomodoroSession, Task, User
+
+
+# Bump when the prompt changes, so every summary is written again.
+PROMPT_VERSION = 1
+SYSTEM_PROMPT = (
+    "You are the best, caring, supportive coach. In 3 to 5 warm sentences, "
+    "sum up the user's day from the notes below, acknowledge what went well "
+    "and suggest one small, concrete step for tomorrow."
+)
+TITLE_CHARS = 60
+NOTES_CHARS = 400
+# Focus time only counts as a material change once it moves to another
+# bucket, so a few extra minutes don't trigger a new summary.
+FOCUS_BUCKET_MINUTES = 15
+PRIORITY_ORDER = {'high': 0, 'medium': 1, 'low': 2}
+
+
+@dataclass
+class TaskLine:
+    title: str
+    status: str
+    priority: str
+    focus_minutes: int = 0
+
+
+@dataclass
+class DayInputs:
+    user_id: int
+    username: str
+    day: date = None
+    tasks_total: int = 0
+    tasks_completed: int = 0
+    pomodoros: int = 0
+    focus_minutes: int = 0
+    points_earned: int = 0
+    mood: str = ''
+    water_intake: int = None
+    exercised: bool = None
+    notes: str = ''
+    tasks: list = field(default_factory=list)
+
+    @property
+    def tasks_pending(self):
+        return self.tasks_total - self.tasks_completed
+
+
+def collect_day_inputs(day, user_ids=None):
+    """Gather the summary inputs of ``day`` for many users at once.
+
+    The counters come from the ``DailyStats`` rollups; the day's tasks,
+    their focus time and the latest journal notes take one query each, so
+    the cost doesn't grow with the number of users. With ``user_ids=None``
+    every user with activity on ``day`` is included; users without activity
+    are only returned when listed explicitly.
+    """
+    stats = DailyStats.objects.filter(date=day)
+    if user_ids is not None:
+        stats = stats.filter(user_id__in=user_ids)
+    else:
+        stats = stats.filter(Q(tasks_due__gt=0) | Q(pomodoros__gt=0) | Q(points_earned__gt=0) | ~Q(mood=''))
+
+    inputs = {
+        row['user']: DayInputs(
+            user_id=row['user'],
+            username=row['user__username'],
+            day=day,
+            tasks_total=row['tasks_due'],
+            tasks_completed=row['tasks_completed'],
+            pomodoros=row['pomodoros'],
+            focus_minutes=row['focus_minutes'],
+            points_earned=row['points_earned'],
+            mood=row['mood'],
+            water_intake=row['water_intake'],
+            exercised=row['exercised'],
+        )
+        for row in stats.values('user', 'user__username', 'tasks_due', 'tasks_completed', 'pomodoros',
+                                'focus_minutes', 'points_earned', 'mood', 'water_intake', 'exercised')
+    }
+    if user_ids is not None:
+        missing = User.objects.filter(pk__in=[pk for pk in user_ids if pk not in inputs])
+        for user_id, username in missing.values_list('pk', 'username'):
+            inputs[user_id] = DayInputs(user_id=user_id, username=username, day=day)
+    if not inputs:
+        return inputs
+
+    start, end = day_range(day)
+    focus = dict(
+        PomodoroSession.objects.filter(user_id__in=list(inputs), completed=True, task__isnull=False,
+                                       start_time__gte=start, start_time__lt=end)
+        .values('task').annotate(minutes=Sum('duration')).order_by().values_list('task', 'minutes')
+    )
+    tasks = (Task.objects.filter(user_id__in=list(inputs))
+             .filter(Q(due_date__gte=start, due_date__lt=end) | Q(completed_at__gte=start, completed_at__lt=end))
+             .order_by('pk').values_list('pk', 'user_id', 'title', 'status', 'priority'))
+    for task_id, user_id, title, status, priority in tasks:
+        inputs[user_id].tasks.append(TaskLine(title, status, priority, focus.get(task_id) or 0))
+
+    entries = (MoodEntry.objects.filter(user_id__in=list(inputs), date=day)
+               .order_by('user', '-time').values_list('user', 'notes', 'diet_summary'))
+    seen = set()
+    for user_id, notes, diet_summary in entries:
+        if user_id not in seen:
+            seen.add(user_id)
+            inputs[user_id].notes = ' '.join(part for part in (notes, diet_summary) if part)
+    return inputs
+
+
+def estimate_tokens(text):
+    # About four characters per token for English text; close enough to
+    # keep the prompt within budget without shipping a tokenizer.
+    return -(-len(text) // 4)
+
+
+def _clip(text, limit):
+    text = re.sub(r'\s+', ' ', text or '').strip()
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + '…'
+
+
+def _task_sort_key(task):
+    return (-task.focus_minutes, PRIORITY_ORDER.get(task.priority, len(PRIORITY_ORDER)), task.title)
+
+
+def _task_line(task):
+    details = [task.priority] + ([f'{task.focus_minutes} min focus'] if task.focus_minutes else [])
+    return f"- {_clip(task.title, TITLE_CHARS)} ({', '.join(details)})"
+
+
+def build_prompt(inputs, budget=None):
+    """Compact the day into prompt text of about ``budget`` tokens.
+
+    The day's totals always go in; the journal notes and then the task
+    lists (completed ones first, then by focus time and priority) are
+    added until the budget runs out, with a count of what was left out.
+    """
+    budget = budget or settings.LLM_PROMPT_TOKENS
+    lines = [
+        f"Name: {inputs.username}" + (f", day: {inputs.day:%A %Y-%m-%d}" if inputs.day else ''),
+        f"Tasks: {inputs.tasks_completed} of {inputs.tasks_total} done, {inputs.tasks_pending} pending",
+        f"Focus: {inputs.pomodoros} Pomodoro session(s), {inputs.focus_minutes} min",
+        f"Points earned: {inputs.points_earned}",
+    ]
+    wellbeing = []
+    if inputs.mood:
+        wellbeing.append(f"mood {inputs.mood.replace('_', ' ')}")
+    if inputs.water_intake is not None:
+        wellbeing.append(f"{inputs.water_intake} cup(s) of water")
+    if inputs.exercised is not None:
+        wellbeing.append('exercised' if inputs.exercised else 'no exercise')
+    if wellbeing:
+        lines.append(f"Wellbeing: {', '.join(wellbeing)}")
+    used = estimate_tokens('\n'.join(lines))
+
+    sections = []
+    if inputs.notes:
+        sections.append(('Journal:', [_clip(inputs.notes, NOTES_CHARS)]))
+    tasks = sorted(inputs.tasks, key=_task_sort_key)
+    for heading, completed in (('Completed tasks:', True), ('Open tasks:', False)):
+        items = [_task_line(task) for task in tasks if (task.status == 'completed') == completed]
+        if items:
+            sections.append((heading, items))
+
+    for heading, items in sections:
+        cost = estimate_tokens(heading) + 1
+        if used + cost > budget:
+            break
+        section, used = [heading], used + cost
+        for index, item in enumerate(items):
+            cost = estimate_tokens(item) + 1
+            if used + cost > budget:
+                section.append(f"- …and {len(items) - index} more")
+                break
+            section.append(item)
+            used += cost
+        lines += section
+    return '\n'.join(lines)
+
+
+def build_messages(inputs, budget=None):
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": build_prompt(inputs, budget)},
+    ]
+
+
+def fingerprint(inputs):
+    """Hash of the inputs that materially change a summary: the totals,
+    mood, journal notes and the day's tasks with their status. Focus time
+    is bucketed, and anything the prompt leaves out is ignored."""
+    material = {
+        'version': PROMPT_VERSION,
+        'totals': [inputs.tasks_total, inputs.tasks_completed, inputs.pomodoros,
+                   inputs.focus_minutes // FOCUS_BUCKET_MINUTES, inputs.points_earned],
+        'wellbeing': [inputs.mood, inputs.water_intake, inputs.exercised],
+        'notes': _clip(inputs.notes, NOTES_CHARS),
+        'tasks': sorted([_clip(task.title, TITLE_CHARS), task.status, task.priority] for task in inputs.tasks),
+    }
+    return hashlib.sha256(json.dumps(material, separators=(',', ':')).encode()).hexdigest()
+
+
+def current_fingerprint(user_id, day):
+    return fingerprint(collect_day_inputs(day, [user_id])[user_id])
+
+
+def save_summary(user_id, day, content, digest=''):
+    with transaction.atomic():
+        summary, _ = AISummary.objects.update_or_create(
+            user_id=user_id, date=day, defaults={'content': content, 'fingerprint': digest},
+        )
+    return summary
+
+
+def generate_summary(user, day, client):
+    """Write the summary of ``day`` unless the stored one was made from the
+    same inputs. Identical prompts reuse a cached completion."""
+    inputs = collect_day_inputs(day, [user.pk])[user.pk]
+    digest = fingerprint(inputs)
+    summary = AISummary.objects.filter(user=user, date=day, fingerprint=digest).first()
+    if summary is not None:
+        return summary
+    return save_summary(user.pk, day, cached_complete(client, build_messages(inputs)), digest)
+
+
+def stream_summary(user_id, day, client):
+    """Yield the summary of ``day`` as the LLM writes it, and save it once
+    the stream completes. A summary that is still current is yielded whole."""
+    inputs = collect_day_inputs(day, [user_id])[user_id]
+    digest = fingerprint(inputs)
+    summary = AISummary.objects.filter(user_id=user_id, date=day, fingerprint=digest).first()
+    if summary is not None:
+        yield summary.content
+        return
+    parts = []
+    for chunk in cached_stream(client, build_messages(inputs)):
+        parts.append(chunk)
+        yield chunk
+    save_summary(user_id, day, ''.join(parts), digest)
+
+
+async def astream_summary(user_id, day, client):
+    """Async version of :func:`stream_summary`."""
+    inputs = (await sync_to_async(collect_day_inputs)(day, [user_id]))[user_id]
+    digest = fingerprint(inputs)
+    summary = await AISummary.objects.filter(user_id=user_id, date=day, fingerprint=digest).afirst()
+    if summary is not None:
+        yield summary.content
+        return
+    parts = []
+    async for chunk in acached_stream(client, build_messages(inputs)):
+        parts.append(chunk)
+        yield chunk
+    await sync_to_async(save_summary)(user_id, day, ''.join(parts), digest)
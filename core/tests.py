@@ -1,3 +1,727 @@
-from django.test import TestCase
+import json
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core import reminders, rollups, search
+from core.imports import import_tasks
+from core.llm import LLMError, StubClient
+from core.metrics import registry as metrics_registry
+from core.models import AISummary, Category, DailyStats, MoodEntry, PointsTransaction, PomodoroSession, Rewards, Task, User
+from core.points import InsufficientPoints, RewardAlreadyClaimed, claim_reward, complete_task
+from core.pomodoro import finish_session, sweep_stale_sessions
+from core.streaks import record_activity
+from core.summaries import current_fingerprint, generate_summary
+from core.throttling import CircuitBreaker
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class CacheIsolatedTestCase(TestCase):
+    """Cached users, versions and completions must not leak between tests
+    (or from the development cache)."""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+
+class ReminderTests(CacheIsolatedTestCase):
+    now = datetime(2026, 3, 2, 12, 0, tzinfo=dt_timezone.utc)
+
+    def make_user(self, username, **fields):
+        user = User.objects.create_user(username, f'{username}@example.com', 'password', **fields)
+        User.objects.filter(pk=user.pk).update(next_reminder_at=self.now - timedelta(minutes=1))
+        return user
+
+    def test_due_reminder_is_sent_and_rescheduled(self):
+        user = self.make_user('anna', reminder_frequency='30min')
+
+        self.assertEqual(reminders.send_due_reminders(now=self.now), 1)
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['anna@example.com'])
+        self.assertEqual(mail.outbox[0].subject, reminders.SUBJECT)
+        user.refresh_from_db()
+        self.assertEqual(user.next_reminder_at, self.now + timedelta(minutes=30))
+
+    def test_reminder_is_sent_once(self):
+        self.make_user('anna')
+
+        reminders.send_due_reminders(now=self.now)
+        reminders.send_due_reminders(now=self.now)
+
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_reminder_outside_working_hours_moves_to_next_window(self):
+        user = self.make_user('bob', preferred_working_hours_start=time(14), preferred_working_hours_end=time(18))
+
+        self.assertEqual(reminders.send_due_reminders(now=self.now), 0)
+
+        self.assertEqual(mail.outbox, [])
+        user.refresh_from_db()
+        self.assertEqual(user.next_reminder_at, self.now.replace(hour=14))
+
+    def test_users_without_working_hours_are_not_emailed_at_night(self):
+        night = self.now.replace(hour=3)
+        user = self.make_user('dan')
+        User.objects.filter(pk=user.pk).update(next_reminder_at=night)
+
+        self.assertEqual(reminders.send_due_reminders(now=night), 0)
+
+        self.assertEqual(mail.outbox, [])
+        user.refresh_from_db()
+        self.assertEqual(user.next_reminder_at, night.replace(hour=9))
+
+    def test_disabling_notifications_clears_the_schedule(self):
+        user = self.make_user('carol')
+        user.enable_notifications = False
+        user.save()
+
+        self.assertIsNone(user.next_reminder_at)
+        self.assertEqual(reminders.send_due_reminders(now=self.now), 0)
+        self.assertEqual(mail.outbox, [])
+
+    def test_due_reminders_are_sent_in_batches(self):
+        for index in range(5):
+            self.make_user(f'user{index}')
+
+        self.assertEqual(reminders.send_due_reminders(now=self.now, batch_size=2), 5)
+
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertGreater(reminders.next_due_at(), self.now)
+
+
+class SearchTests(CacheIsolatedTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('anna', 'anna@example.com', 'password')
+
+    def add_task(self, title, description='', user=None):
+        user = user or self.user
+        return Task.objects.create(
+            user=user, category=Category.objects.get(user=user, name='work'),
+            title=title, description=description, due_date=timezone.now(),
+        )
+
+    def test_title_matches_rank_above_description_matches(self):
+        in_body = self.add_task('Weekly planning', 'Draft the quarterly report outline')
+        in_title = self.add_task('Quarterly report', 'Collect the numbers')
+
+        hits = search.search(self.user.pk, 'quarterly report')
+
+        self.assertEqual([obj for _, obj, *_ in hits], [in_title, in_body])
+        self.assertGreater(hits[0][2], hits[1][2])
+
+    def test_matches_are_highlighted_and_html_escaped(self):
+        self.add_task('<script>alert(1)</script> budget review', 'Check the <b>budget</b> numbers')
+
+        [(kind, _, _, title, snippet)] = search.search(self.user.pk, 'budget')
+
+        self.assertEqual(kind, 'task')
+        self.assertIn('<mark>budget</mark>', title)
+        self.assertIn('&lt;script&gt;', title)
+        self.assertNotIn('<script>', title)
+        self.assertIn('&lt;b&gt;<mark>budget</mark>&lt;/b&gt;', snippet)
+
+    def test_query_syntax_is_treated_as_text(self):
+        self.add_task('Budget review')
+
+        for query in ['budget"', 'budget OR', 'budget AND (', '-budget*', 'NEAR(budget']:
+            with self.subTest(query=query):
+                search.search(self.user.pk, query)
+        self.assertEqual(search.search(self.user.pk, '"'), [])
+
+    def test_journal_entries_are_searched(self):
+        entry = MoodEntry.objects.create(user=self.user, mood='happy', notes='Long walk by the river')
+
+        [(kind, obj, _, title, snippet)] = search.search(self.user.pk, 'river')
+
+        self.assertEqual((kind, obj, title), ('journal', entry, ''))
+        self.assertIn('<mark>river</mark>', snippet)
+
+    def test_other_users_entries_are_not_returned(self):
+        other = User.objects.create_user('bob', 'bob@example.com', 'password')
+        self.add_task('Dentist appointment', user=other)
+
+        self.assertEqual(search.search(self.user.pk, 'dentist'), [])
+
+    def test_index_follows_updates_and_deletes(self):
+        task = self.add_task('Renew passport')
+        task.title = 'Renew driving licence'
+        task.save()
+
+        self.assertEqual(search.search(self.user.pk, 'passport'), [])
+        self.assertEqual(len(search.search(self.user.pk, 'licence')), 1)
+        task.delete()
+        self.assertEqual(search.search(self.user.pk, 'licence'), [])
+
+    def test_imported_tasks_are_searchable(self):
+        created, errors = import_tasks(self.user, [
+            {'title': 'Imported groceries list', 'category': 'work'},
+            {'title': 'Imported gym plan', 'category': 'health', 'description': 'Three sessions of groceries-free cardio'},
+        ])
+
+        self.assertEqual((created, errors), (2, []))
+        titles = [obj.title for _, obj, *_ in search.search(self.user.pk, 'groceries')]
+        self.assertEqual(titles, ['Imported groceries list', 'Imported gym plan'])
+
+    def test_api_search(self):
+        self.add_task('Call the plumber')
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse('api_search'), {'q': 'plumber'})
+
+        self.assertEqual(response.status_code, 200)
+        [result] = response.json()['results']
+        self.assertEqual(result['type'], 'task')
+        self.assertEqual(result['object']['title'], 'Call the plumber')
+        self.assertEqual(self.client.get(reverse('api_search')).status_code, 400)
+
+
+class SummaryFingerprintTests(CacheIsolatedTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('anna', 'anna@example.com', 'password')
+        self.day = timezone.localdate()
+        noon = timezone.make_aware(datetime.combine(self.day, time(12)))
+        self.task = Task.objects.create(
+            user=self.user, category=Category.objects.get(user=self.user, name='work'),
+            title='Write the report', due_date=noon, points=5,
+        )
+        self.session = PomodoroSession.objects.create(
+            user=self.user, task=self.task, start_time=noon, duration=20, completed=True,
+        )
+
+    def fingerprint(self):
+        return current_fingerprint(self.user.pk, self.day)
+
+    def set_focus_minutes(self, minutes):
+        self.session.duration = minutes
+        self.session.save()
+
+    def test_small_focus_change_keeps_the_fingerprint(self):
+        before = self.fingerprint()
+        self.set_focus_minutes(24)
+
+        self.assertEqual(self.fingerprint(), before)
+
+    def test_focus_change_to_another_bucket_changes_the_fingerprint(self):
+        before = self.fingerprint()
+        self.set_focus_minutes(35)
+
+        self.assertNotEqual(self.fingerprint(), before)
+
+    def test_completing_a_task_changes_the_fingerprint(self):
+        before = self.fingerprint()
+        complete_task(self.task)
+
+        self.assertNotEqual(self.fingerprint(), before)
+
+    def test_summary_is_only_regenerated_on_material_changes(self):
+        client = StubClient()
+        with mock.patch.object(client, 'complete', wraps=client.complete) as complete:
+            summary = generate_summary(self.user, self.day, client)
+            self.set_focus_minutes(24)
+            self.assertEqual(generate_summary(self.user, self.day, client), summary)
+            self.assertEqual(complete.call_count, 1)
+
+            complete_task(self.task)
+            generate_summary(self.user, self.day, client)
+            self.assertEqual(complete.call_count, 2)
+
+        self.assertEqual(AISummary.objects.get(user=self.user).fingerprint, self.fingerprint())
+
+
+class CircuitBreakerTests(TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch('core.throttling.time.monotonic', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+
+    def fail(self, times):
+        for _ in range(times):
+            self.breaker.record_failure()
+
+    def test_opens_after_consecutive_failures(self):
+        self.fail(2)
+        self.assertTrue(self.breaker.allow())
+
+        self.fail(1)
+        self.assertTrue(self.breaker.is_open)
+        self.assertFalse(self.breaker.allow())
+
+    def test_success_resets_the_failure_count(self):
+        self.fail(2)
+        self.breaker.record_success()
+        self.fail(2)
+
+        self.assertFalse(self.breaker.is_open)
+
+    def test_half_open_lets_one_trial_call_through(self):
+        self.fail(3)
+        self.now += 30
+
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())
+
+    def test_successful_trial_closes_the_circuit(self):
+        self.fail(3)
+        self.now += 30
+        self.breaker.allow()
+        self.breaker.record_success()
+
+        self.assertFalse(self.breaker.is_open)
+        self.assertTrue(self.breaker.allow())
+
+    def test_failed_trial_keeps_the_circuit_open(self):
+        self.fail(3)
+        self.now += 30
+        self.breaker.allow()
+        self.breaker.record_failure()
+
+        self.assertFalse(self.breaker.allow())
+        self.now += 30
+        self.assertTrue(self.breaker.allow())
+
+
+def parse_events(body):
+    events = []
+    for block in body.decode().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.splitlines())
+        if 'event' in fields:
+            events.append((fields['event'], json.loads(fields['data'])))
+    return events
+
+
+@override_settings(LLM_CLIENT='core.llm.StubClient')
+class SummaryStreamTests(CacheIsolatedTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('anna', 'anna@example.com', 'password')
+        self.day = timezone.localdate()
+        self.url = reverse('daily_summary_stream')
+
+    def stream(self):
+        self.client.force_login(self.user)
+        response = self.client.get(self.url)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        return parse_events(b''.join(response.streaming_content))
+
+    def test_tokens_then_done(self):
+        events = self.stream()
+
+        self.assertGreater(len(events), 2)
+        self.assertEqual({name for name, _ in events[:-1]}, {'token'})
+        self.assertEqual(events[-1], ('done', ''))
+        summary = AISummary.objects.get(user=self.user, date=self.day)
+        self.assertEqual(''.join(data for _, data in events[:-1]), summary.content)
+        self.assertEqual(summary.fingerprint, current_fingerprint(self.user.pk, self.day))
+
+    def test_current_summary_is_sent_whole(self):
+        content = ''.join(data for name, data in self.stream() if name == 'token')
+
+        with mock.patch.object(StubClient, 'stream') as stream:
+            self.assertEqual(self.stream(), [('token', content), ('done', '')])
+        stream.assert_not_called()
+
+    def test_provider_errors_end_with_an_error_event(self):
+        with mock.patch.object(StubClient, 'stream', side_effect=LLMError('down')):
+            events = self.stream()
+
+        self.assertEqual(events[-1][0], 'error')
+        self.assertFalse(AISummary.objects.filter(user=self.user).exists())
+
+    async def test_asgi_stream(self):
+        client = AsyncClient()
+        await client.aforce_login(self.user)
+
+        with mock.patch('core.views.stream_summary') as stream_summary:
+            response = await client.get(self.url)
+            body = b''.join([chunk async for chunk in response.streaming_content])
+        stream_summary.assert_not_called()
+
+        events = parse_events(body)
+        self.assertEqual(events[-1], ('done', ''))
+        self.assertTrue(await AISummary.objects.filter(user=self.user, date=self.day).aexists())
+
+
+class PomodoroApiTests(CacheIsolatedTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('anna', 'anna@example.com', 'password')
+        self.task = Task.objects.create(
+            user=self.user, category=Category.objects.get(user=self.user, name='work'),
+            title='Write the report', due_date=timezone.now(),
+        )
+        self.client.force_login(self.user)
+        self.start = timezone.now() - timedelta(minutes=30)
+        self.url = reverse('api_collection', args=['pomodoro-sessions'])
+
+    def post(self, **data):
+        payload = {'task': self.task.pk, 'start_time': self.start.isoformat(), 'duration': 25, **data}
+        return self.client.post(self.url, payload, content_type='application/json')
+
+    def assert_finished_once(self, minutes):
+        self.user.refresh_from_db()
+        self.task.refresh_from_db()
+        stats = DailyStats.objects.get(user=self.user, date=timezone.localdate(self.start))
+        self.assertEqual(self.user.total_pomodoro_sessions, 1)
+        self.assertEqual(self.user.last_active_date, timezone.localdate())
+        self.assertEqual(self.task.actual_completed_at, minutes)
+        self.assertEqual((stats.pomodoros, stats.focus_minutes), (1, minutes))
+
+    def test_creating_a_completed_session_finishes_it(self):
+        end = self.start + timedelta(minutes=20)
+        response = self.post(completed=True, end_time=end.isoformat())
+
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        self.assertEqual((data['completed'], data['duration'], data['planned_duration']), (True, 20, 25))
+        self.assert_finished_once(20)
+
+    def test_completing_a_session_with_patch_finishes_it_once(self):
+        session_id = self.post().json()['id']
+        url = reverse('api_detail', args=['pomodoro-sessions', session_id])
+
+        for _ in range(2):
+            response = self.client.patch(url, {'completed': True}, content_type='application/json')
+            self.assertEqual(response.status_code, 200)
+
+        self.assertTrue(response.json()['completed'])
+        self.assert_finished_once(25)
+
+
+class FinishSessionTests(CacheIsolatedTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('anna', 'anna@example.com', 'password')
+        self.task = Task.objects.create(
+            user=self.user, category=Category.objects.get(user=self.user, name='work'), title='Write the report',
+        )
+        self.start = timezone.now() - timedelta(minutes=30)
+        self.session = PomodoroSession.objects.create(
+            user=self.user, task=self.task, start_time=self.start, duration=25,
+        )
+
+    def test_second_finish_is_a_no_op(self):
+        end = self.start + timedelta(minutes=20)
+
+        self.assertEqual(finish_session(self.session, now=end), 20)
+        self.assertIsNone(finish_session(self.session, now=end + timedelta(minutes=5)))
+
+        self.session.refresh_from_db()
+        self.user.refresh_from_db()
+        self.task.refresh_from_db()
+        stats = DailyStats.objects.get(user=self.user, date=timezone.localdate(self.start))
+        self.assertEqual((self.session.end_time, self.session.duration, self.session.planned_duration), (end, 20, 25))
+        self.assertEqual(self.user.total_pomodoro_sessions, 1)
+        self.assertEqual(self.task.actual_completed_at, 20)
+        self.assertEqual((stats.pomodoros, stats.focus_minutes), (1, 20))
+
+    def test_focus_is_capped_at_the_planned_length(self):
+        self.assertEqual(finish_session(self.session, now=self.start + timedelta(hours=2)), 25)
+
+    def test_swept_session_cannot_be_finished(self):
+        PomodoroSession.objects.filter(pk=self.session.pk).update(start_time=self.start - timedelta(hours=7))
+        sweep_stale_sessions()
+
+        self.assertIsNone(finish_session(self.session))
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.total_pomodoro_sessions, 0)
+        self.assertFalse(DailyStats.objects.filter(user=self.user, pomodoros__gt=0).exists())
+
+
+class StreakTests(CacheIsolatedTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('anna', 'anna@example.com', 'password')
+        self.today = timezone.localdate()
+
+    def at_noon(self, day):
+        return timezone.make_aware(datetime.combine(day, time(12)))
+
+    def add_history(self, user, task_days=(), session_days=(), mood_days=()):
+        category = Category.objects.get(user=user, name='work')
+        for day in task_days:
+            Task.objects.create(
+                user=user, category=category, title='Task', status='completed', completed_at=self.at_noon(day),
+            )
+        for day in session_days:
+            PomodoroSession.objects.create(user=user, start_time=self.at_noon(day), duration=25, completed=True)
+        for day in mood_days:
+            entry = MoodEntry.objects.create(user=user, mood='happy')
+            MoodEntry.objects.filter(pk=entry.pk).update(date=day)
+
+    def streak(self, user):
+        user.refresh_from_db()
+        return user.last_active_date, user.streak_days
+
+    def test_record_activity(self):
+        day = self.today - timedelta(days=5)
+
+        record_activity(self.user.pk, day)
+        record_activity(self.user.pk, day + timedelta(days=1))
+        self.assertEqual(self.streak(self.user), (day + timedelta(days=1), 2))
+
+        self.assertEqual(record_activity(self.user.pk, day + timedelta(days=1)), 0)
+        self.assertEqual(record_activity(self.user.pk, day), 0)
+        self.assertEqual(self.streak(self.user), (day + timedelta(days=1), 2))
+
+        record_activity(self.user.pk, day + timedelta(days=3))
+        self.assertEqual(self.streak(self.user), (day + timedelta(days=3), 1))
+
+    def test_rebuild_matches_record_activity(self):
+        days = [self.today - timedelta(days=offset) for offset in (6, 5, 3, 2, 1)]
+        self.add_history(self.user, task_days=days[0::4], session_days=days[2:], mood_days=days[1:4:2])
+        replayed = User.objects.create_user('bob', 'bob@example.com', 'password')
+        for day in days:
+            record_activity(replayed.pk, day)
+
+        call_command('rebuild_streaks', '--user', str(self.user.pk), stdout=StringIO())
+
+        self.assertEqual(self.streak(self.user), (days[-1], 3))
+        self.assertEqual(self.streak(self.user), self.streak(replayed))
+
+    def test_rebuild_resets_users_without_activity(self):
+        User.objects.filter(pk=self.user.pk).update(last_active_date=self.today, streak_days=4)
+
+        call_command('rebuild_streaks', '--user', str(self.user.pk), stdout=StringIO())
+
+        self.assertEqual(self.streak(self.user), (None, 0))
+
+
+class ClaimRewardTests(CacheIsolatedTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('anna', 'anna@example.com', 'password')
+        User.objects.filter(pk=self.user.pk).update(points=100)
+
+    def add_reward(self, points):
+        return Rewards.objects.create(user=self.user, title='Cinema', points=points)
+
+    def test_claim_spends_the_points(self):
+        reward = self.add_reward(60)
+
+        claim_reward(self.user, reward)
+
+        self.user.refresh_from_db()
+        reward.refresh_from_db()
+        self.assertEqual(self.user.points, 40)
+        self.assertTrue(reward.is_claimed)
+        self.assertEqual(
+            list(PointsTransaction.objects.values_list('kind', 'amount', 'reward')),
+            [(PointsTransaction.KIND_REWARD, -60, reward.pk)],
+        )
+
+    def test_insufficient_points_leave_everything_untouched(self):
+        reward = self.add_reward(150)
+
+        with self.assertRaises(InsufficientPoints):
+            claim_reward(self.user, reward)
+
+        self.user.refresh_from_db()
+        reward.refresh_from_db()
+        self.assertEqual(self.user.points, 100)
+        self.assertFalse(reward.is_claimed)
+        self.assertFalse(PointsTransaction.objects.exists())
+
+    def test_balance_is_checked_in_the_database(self):
+        first, second = self.add_reward(60), self.add_reward(60)
+        claim_reward(self.user, first)
+
+        # self.user still holds the stale balance of 100 points.
+        with self.assertRaises(InsufficientPoints):
+            claim_reward(self.user, second)
+
+        self.user.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(self.user.points, 40)
+        self.assertFalse(second.is_claimed)
+
+    def test_reward_is_claimed_once(self):
+        reward = self.add_reward(30)
+        claim_reward(self.user, reward)
+
+        with self.assertRaises(RewardAlreadyClaimed):
+            claim_reward(self.user, reward)
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.points, 70)
+        self.assertEqual(PointsTransaction.objects.count(), 1)
+
+
+class DailyStatsTests(CacheIsolatedTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('anna', 'anna@example.com', 'password')
+        self.today = timezone.localdate()
+        self.yesterday = self.today - timedelta(days=1)
+
+    def at_noon(self, day):
+        return timezone.make_aware(datetime.combine(day, time(12)))
+
+    def counters(self, day, *fields):
+        return tuple(getattr(rollups.stats_for(self.user.pk, day), field) for field in fields)
+
+    def rolled_up(self):
+        fields = ('date', 'tasks_due', 'tasks_completed', 'pomodoros', 'focus_minutes', 'points_earned')
+        rows = DailyStats.objects.filter(user=self.user).order_by('date').values_list(*fields)
+        return [row for row in rows if any(row[1:])]
+
+    def assert_matches_rebuild(self):
+        incremental = self.rolled_up()
+        rollups.rebuild([self.user.pk])
+        self.assertEqual(self.rolled_up(), incremental)
+
+    def test_task_update_and_delete(self):
+        task = Task.objects.create(
+            user=self.user, category=Category.objects.get(user=self.user, name='work'), title='Write the report',
+            due_date=self.at_noon(self.yesterday), points=15,
+        )
+        self.assertEqual(self.counters(self.yesterday, 'tasks_due', 'tasks_completed'), (1, 0))
+
+        task.status, task.completed_at = 'completed', self.at_noon(self.today)
+        task.save()
+        self.assertEqual(self.counters(self.yesterday, 'tasks_due', 'tasks_completed'), (1, 1))
+        self.assertEqual(self.counters(self.today, 'points_earned'), (15,))
+
+        task.due_date = self.at_noon(self.today)
+        task.save()
+        self.assertEqual(self.counters(self.yesterday, 'tasks_due', 'tasks_completed'), (0, 0))
+        self.assertEqual(self.counters(self.today, 'tasks_due', 'tasks_completed', 'points_earned'), (1, 1, 15))
+        self.assert_matches_rebuild()
+
+        Task.objects.get(pk=task.pk).delete()
+        self.assertEqual(self.counters(self.today, 'tasks_due', 'tasks_completed', 'points_earned'), (0, 0, 0))
+
+    def test_session_update_and_delete(self):
+        session = PomodoroSession.objects.create(
+            user=self.user, start_time=self.at_noon(self.yesterday), duration=25, completed=True,
+        )
+        self.assertEqual(self.counters(self.yesterday, 'pomodoros', 'focus_minutes'), (1, 25))
+
+        session.duration = 15
+        session.save()
+        self.assertEqual(self.counters(self.yesterday, 'pomodoros', 'focus_minutes'), (1, 15))
+
+        session.start_time = self.at_noon(self.today)
+        session.save()
+        self.assertEqual(self.counters(self.yesterday, 'pomodoros', 'focus_minutes'), (0, 0))
+        self.assertEqual(self.counters(self.today, 'pomodoros', 'focus_minutes'), (1, 15))
+        self.assert_matches_rebuild()
+
+        PomodoroSession.objects.get(pk=session.pk).delete()
+        self.assertEqual(self.counters(self.today, 'pomodoros', 'focus_minutes'), (0, 0))
+
+    def test_incomplete_sessions_are_not_rolled_up(self):
+        session = PomodoroSession.objects.create(user=self.user, start_time=self.at_noon(self.today), duration=25)
+        session.delete()
+
+        self.assertFalse(DailyStats.objects.filter(user=self.user).exists())
+
+
+class JournalApiTests(CacheIsolatedTestCase):
+    def test_creating_an_entry_records_activity(self):
+        user = User.objects.create_user('anna', 'anna@example.com', 'password')
+        User.objects.filter(pk=user.pk).update(last_active_date=timezone.localdate() - timedelta(days=1), streak_days=3)
+        self.client.force_login(user)
+
+        response = self.client.post(
+            reverse('api_collection', args=['mood-entries']), {'mood': 'happy', 'water_intake': 4, 'notes': 'Good day'},
+            content_type='application/json',
+        )
+
+        self.assertEqual(response.status_code, 201)
+        user.refresh_from_db()
+        self.assertEqual((user.streak_days, user.last_active_date), (4, timezone.localdate()))
+
+
+class ExportTests(CacheIsolatedTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('anna', 'anna@example.com', 'password')
+        category = Category.objects.get(user=self.user, name='work')
+        for index in range(3):
+            Task.objects.create(user=self.user, category=category, title=f'Task {index}', due_date=timezone.now())
+        self.url = reverse('export_data')
+
+    def test_wsgi_export_streams_ndjson(self):
+        self.client.force_login(self.user)
+        response = self.client.get(self.url, {'dataset': 'tasks'})
+
+        self.assertFalse(response.is_async)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line)['title'] for line in lines], ['Task 0', 'Task 1', 'Task 2'])
+
+    async def test_asgi_export_is_an_async_stream(self):
+        client = AsyncClient()
+        await client.aforce_login(self.user)
+
+        response = await client.get(self.url, {'dataset': 'tasks', 'format': 'csv'})
+
+        self.assertTrue(response.is_async)
+        header, *rows = b''.join([chunk async for chunk in response.streaming_content]).decode().splitlines()
+        self.assertTrue(header.startswith('id,title,'))
+        self.assertEqual([row.split(',')[1] for row in rows], ['Task 0', 'Task 1', 'Task 2'])
+        self.assertEqual((await client.get(self.url, {'dataset': 'all', 'format': 'csv'})).status_code, 400)
+
+
+class TaskImportTests(CacheIsolatedTestCase):
+    def test_completed_tasks_are_credited_like_complete_task(self):
+        user = User.objects.create_user('anna', 'anna@example.com', 'password')
+
+        created, errors = import_tasks(user, [
+            {'title': 'Done one', 'category': 'work', 'status': 'completed', 'points': 4},
+            {'title': 'Done two', 'category': 'work', 'status': 'completed', 'points': 6},
+            {'title': 'Open', 'category': 'work'},
+        ])
+
+        self.assertEqual((created, errors), (3, []))
+        user.refresh_from_db()
+        today = timezone.localdate()
+        self.assertEqual((user.points, user.total_completed_tasks), (10, 2))
+        self.assertEqual((user.streak_days, user.last_active_date), (1, today))
+        self.assertEqual(sorted(PointsTransaction.objects.filter(user=user).values_list('amount', flat=True)), [4, 6])
+        self.assertEqual(DailyStats.objects.get(user=user, date=today).points_earned, 10)
+
+
+class PrecomputeSummariesTests(CacheIsolatedTestCase):
+    def test_retries_must_be_positive(self):
+        with self.assertRaisesMessage(CommandError, '--retries'):
+            call_command('precompute_summaries', '--retries', '0', stdout=StringIO())
+
+
+class RequestMetricsTests(CacheIsolatedTestCase):
+    def setUp(self):
+        super().setUp()
+        metrics_registry.reset()
+        self.addCleanup(metrics_registry.reset)
+        self.user = User.objects.create_user('anna', 'anna@example.com', 'password')
+        self.client.force_login(self.user)
+
+    def test_unknown_methods_share_one_label(self):
+        self.client.generic('BREW', reverse('dashboard'))
+        self.client.generic('PROPFIND', reverse('dashboard'))
+
+        methods = {method for _, method, _ in metrics_registry.requests}
+        self.assertEqual(methods, {'other'})
+
+    def test_streaming_responses_are_recorded_when_the_stream_ends(self):
+        response = self.client.get(reverse('export_data'), {'dataset': 'tasks'})
+        self.assertNotIn('export_data', metrics_registry.views)
+
+        b''.join(response.streaming_content)
+
+        stats = metrics_registry.views['export_data']
+        self.assertEqual(stats.count, 1)
+        self.assertGreater(stats.queries, 0)
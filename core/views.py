@@ -1,18 +1,33 @@
-from django.http import JsonResponse
+import json
+from datetime import date
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.forms import AuthenticationForm
 from django.contrib.auth import login, logout
 from django.contrib.auth.decorators import login_required
-from core.forms import UserRegisterForm, TaskForm, MoodEntryForm, RewardForm, SettingsForm
-from core.models import Task, DailyQuote, MoodEntry, PomodoroSession, Category, BreathingExercise, Rewards, AISummary
-from datetime import date
-from collections import defaultdict
+from core.forms import UserRegisterForm, TaskForm, TaskImportForm, MoodEntryForm, RewardForm, SettingsForm
+from core.models import Task, MoodEntry, PomodoroSession, Category, Rewards, AISummary
+from core.snapshots import aget_dashboard_snapshot
+from core.catalog import daily_quote, daily_breathing_exercise
+from core.counters import with_status_counts, status_counts
+from core.llm import LLMError, get_llm_client
+from core.summaries import astream_summary, current_fingerprint, stream_summary
+from core.pagination import akeyset_page
+from core.exports import aexport_stream, export_stream, export_filename
+from core.imports import import_tasks, read_rows, ImportFileError
+from core.metrics import registry as metrics_registry
+from core.streaks import record_activity
+from core.pomodoro import finish_session
+from core.rollups import stats_range
+from core.points import complete_task, claim_reward, RewardAlreadyClaimed, InsufficientPoints
 from django.contrib import messages
 from django.utils import timezone
 from django.utils.timezone import localdate
-from django.db.models import Sum
+from django.db.models.functions import TruncDate
 from django.conf import settings
-from openai import OpenAI
 from django.core.mail import send_mail
 from django.http import HttpResponse
 
@@ -20,6 +35,17 @@ from django.http import HttpResponse
 
 
 
+def metrics(request):
+    token = settings.METRICS_TOKEN
+    if token:
+        allowed = request.headers.get('Authorization') == f'Bearer {token}'
+    else:
+        allowed = request.META.get('REMOTE_ADDR') in settings.METRICS_ALLOWED_IPS
+    if not allowed:
+        return HttpResponse(status=403)
+    return HttpResponse(metrics_registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
 def home(request):
     return render(request, 'core/home.html')
 
@@ -63,48 +89,40 @@ def user_settings(request):
     return render(request, 'core/user_settings.html', {'form': form})
 
 
-@login_required
-def dashboard(request):
-    user = request.user
-    today = localdate()
-
+async def _auser(request):
+    # Resolve the lazy request.user once so templates and context
+    # processors don't hit the database from the event loop.
+    request.user = await request.auser()
+    return request.user
 
-    today_tasks_qs = Task.objects.filter(
-        user=user,
-        due_date__date=today
-    ).order_by('priority', 'due_date')
 
-    today_tasks = today_tasks_qs[:5]
-
-    completed_today = today_tasks_qs.filter(status='completed')
-    pending_overall = Task.objects.filter(category__user=user).exclude(status='completed')
+@login_required
+async def dashboard(request):
+    user = await _auser(request)
+    today = localdate()
 
-    pomodoro_today = PomodoroSession.objects.filter(
-        user=user,
-        start_time__date=today
-    ).count()
+    snapshot = await aget_dashboard_snapshot(user, today)
 
-    mood_entry = MoodEntry.objects.filter(user=user, date=today).order_by('-time').first()
-    breathing_exercise = BreathingExercise.objects.filter(is_active=True).order_by('?').first()
-    quote = DailyQuote.objects.filter(is_active=True).order_by('?').first()
-    categories = Category.objects.filter(user=user, is_active=True)
+    breathing_exercise = await sync_to_async(daily_breathing_exercise)(user.pk, today)
+    quote = await sync_to_async(daily_quote)(user.pk, today)
 
     context = {
-        'today_tasks': today_tasks,
-        'today_tasks_count': today_tasks_qs.count(),
-        'completed_today_count': completed_today.count(),
-        'pending_tasks_count': pending_overall.count(),  # ogólna liczba zadań oczekujących
+        'today_tasks': snapshot['today_tasks'],
+        'today_tasks_count': snapshot['today_tasks_count'],
+        'completed_today_count': snapshot['completed_today_count'],
+        'pending_tasks_count': snapshot['pending_tasks_count'],  # ogólna liczba zadań oczekujących
 
         'total_points': user.points,  # ogólna suma punktów
-        'pomodoro_sessions': pomodoro_today,
-        'streak_days': user.streak_days,
-        'mood_entry': mood_entry,
+        'pomodoro_sessions': snapshot['pomodoro_today'],
+        'total_pomodoros': user.total_pomodoro_sessions,
+        'streak_days': user.current_streak,
+        'mood_entry': snapshot['mood_entry'],
         'quote': quote,
-        'categories': categories,
+        'categories': snapshot['categories'],
         'breathing_exercise': breathing_exercise,
-        'reminder_frequency': request.user.reminder_frequency,
-        'enable_notifications': request.user.enable_notifications,
-        'enable_sound': request.user.enable_sound,
+        'reminder_frequency': user.reminder_frequency,
+        'enable_notifications': user.enable_notifications,
+        'enable_sound': user.enable_sound,
     }
 
     return render(request, 'core/dashboard.html', context)
@@ -113,31 +131,33 @@ def dashboard(request):
 @login_required
 def task_categories(request):
     user = request.user
-    categories = Category.objects.filter(user=user, is_active=True)
+    categories = with_status_counts(Category.objects.filter(user=user, is_active=True))
     category_data = []
     for category in categories:
-        task_count = Task.objects.filter(user=user, category=category).count()
-        category_data.append({'category': category, 'task_count': task_count})
-        context = {
-                    'category_data': category_data
-                    }
+        counts = status_counts(category)
+        category_data.append({
+            'category': category,
+            'task_count': sum(counts.values()),
+            'status_counts': counts,
+        })
+    context = {
+        'category_data': category_data
+    }
     return render(request, 'core/task_categories.html', context)
 
 @login_required
 def tasks_by_category(request, pk):
-    category = get_object_or_404(Category, pk=pk, user=request.user)
+    category = get_object_or_404(with_status_counts(Category.objects.filter(user=request.user)), pk=pk)
 
-    tasks = Task.objects.filter(user=request.user, category=category)
-
-    grouped_tasks = {
-        'To Do': tasks.filter(status='todo').order_by('due_date'),
-        'In Progress': tasks.filter(status='in_progress').order_by('due_date'),
-        'Completed': tasks.filter(status='completed').order_by('due_date'),
-    }
+    grouped_tasks = {label: [] for _, label in Task.STATUS_CHOICES}
+    labels = dict(Task.STATUS_CHOICES)
+    for task in Task.objects.filter(user=request.user, category=category).order_by('due_date'):
+        grouped_tasks[labels[task.status]].append(task)
 
     context = {
         'category': category,
-        'grouped_tasks': grouped_tasks
+        'grouped_tasks': grouped_tasks,
+        'status_counts': status_counts(category),
     }
     return render(request, 'core/tasks_by_category.html', context)
 
@@ -160,6 +180,35 @@ def task_create(request):
     return render(request, 'core/task_form.html', context)
 
 
+@login_required
+def task_import(request):
+    created, errors = None, []
+    if request.method == 'POST':
+        form = TaskImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            try:
+                created, errors = import_tasks(request.user, read_rows(form.cleaned_data['file']))
+            except ImportFileError as e:
+                form.add_error('file', str(e))
+                if e.created:
+                    messages.warning(request, f"Imported {e.created} task{'s' if e.created != 1 else ''} before the error.")
+            else:
+                if created:
+                    messages.success(request, f"Imported {created} task{'s' if created != 1 else ''}.")
+                if errors:
+                    messages.warning(request, f"{len(errors)} row{'s' if len(errors) != 1 else ''} could not be imported.")
+    else:
+        form = TaskImportForm()
+
+    context = {
+        'form': form,
+        'created': created,
+        'errors': errors[:200],
+        'hidden_errors': max(len(errors) - 200, 0),
+    }
+    return render(request, 'core/task_import.html', context)
+
+
 @login_required
 def task_edit(request, pk):
     task = get_object_or_404(Task, pk=pk, user=request.user)
@@ -196,76 +245,84 @@ def task_delete(request, pk):
 def task_complete(request, pk):
     task = get_object_or_404(Task, pk=pk, user=request.user)
 
-    if task.status != 'completed':
-        task.status = 'completed'
-        task.save()
-
-        request.user.points += task.points
-        request.user.total_completed_tasks += 1
-        request.user.save()
-
+    if complete_task(task):
         messages.success(request, f"Task completed! You earned {task.points} points.")
     else:
         messages.info(request, "This task is already completed.")
 
-    return redirect('tasks_by_category', pk=task.category.pk)
+    return redirect('tasks_by_category', pk=task.category_id)
 
 
 
 @login_required
-def pomodoro_view(request):
-    user = request.user
+async def pomodoro_view(request):
+    user = await _auser(request)
     context = {
-        'tasks': Task.objects.filter(user=user).exclude(status='completed').order_by('-due_date'),
+        'tasks': [task async for task in Task.objects.filter(user=user).exclude(status='completed').order_by('-due_date')],
         'focus_time': user.focus_time,
         'break_time': user.break_time,
     }
     return render(request, 'core/pomodoro.html', context)
 
 @login_required
-def start_pomodoro(request):
-    user = request.user
+async def start_pomodoro(request):
+    user = await _auser(request)
     if request.method == 'POST':
         task_id = request.POST.get('task_id')
-        task = Task.objects.filter(id=task_id, user=request.user).first() if task_id else None
+        task = await Task.objects.filter(id=task_id, user=user).afirst() if task_id else None
 
-        session = PomodoroSession.objects.create(
-            user=request.user,
+        session = await PomodoroSession.objects.acreate(
+            user=user,
             task=task,
             start_time=timezone.now(),
             duration=user.focus_time,
+            planned_duration=user.focus_time,
         )
         return JsonResponse({'session_id': session.id})
     return JsonResponse({'error': 'Invalid request'}, status=400)
 
 @login_required
-def end_pomodoro(request):
+async def end_pomodoro(request):
+    user = await _auser(request)
     if request.method == 'POST':
         session_id = request.POST.get('session_id')
         note = request.POST.get('note', '')
 
-        session = get_object_or_404(PomodoroSession, id=session_id, user=request.user)
-        session.end_time = timezone.now()
-        session.completed = True
-        if note:
-            session.notes = note
-        session.save()
-        return JsonResponse({'status': 'saved'})
+        try:
+            session = await PomodoroSession.objects.aget(id=session_id, user=user)
+        except (PomodoroSession.DoesNotExist, ValueError):
+            raise Http404('No PomodoroSession matches the given query.')
+        minutes = await sync_to_async(finish_session)(session, note)
+        if minutes is None:
+            return JsonResponse({'status': 'already_closed'})
+        return JsonResponse({'status': 'saved', 'duration': minutes})
     return JsonResponse({'error': 'Invalid request'}, status=400)
 
 
 @login_required
-def pomodoro_history(request):
-    sessions = PomodoroSession.objects.filter(user=request.user, completed=True).order_by('-start_time')
-
-    history = defaultdict(list)
-    for session in sessions:
-        session_date = session.start_time.strftime('%Y-%m-%d')
-        history[session_date].append(session)
-
-    sorted_history = dict(sorted(history.items(), reverse=True))
-
-    return render(request, 'core/pomodoro_history.html', {'history': sorted_history})
+async def pomodoro_history(request):
+    user = await _auser(request)
+    sessions = (PomodoroSession.objects.filter(user=user, completed=True)
+                .select_related('task')
+                .annotate(day=TruncDate('start_time')))
+    page = await akeyset_page(sessions, ['start_time', 'id'], request.GET.get('cursor'))
+
+    history = []
+    if page.items:
+        totals = {
+            stats.date: {'count': stats.pomodoros, 'minutes': stats.focus_minutes}
+            async for stats in stats_range(user.pk, page.items[-1].day, page.items[0].day)
+        }
+        for session in page.items:
+            if not history or history[-1]['date'] != session.day:
+                history.append({'date': session.day, 'sessions': [], **totals.get(session.day, {})})
+            history[-1]['sessions'].append(session)
+
+    return render(request, 'core/pomodoro_history.html', {
+        'history': history,
+        'page': page,
+        'total_sessions': user.total_pomodoro_sessions,
+    })
 
 
 @login_required
@@ -277,6 +334,7 @@ def journal_view(request):
         form = MoodEntryForm(request.POST, instance=mood_entry)
         if form.is_valid():
             form.save()
+            record_activity(request.user.pk, today)
             return redirect('journal_history')
 
     else:
@@ -286,9 +344,10 @@ def journal_view(request):
 
 
 @login_required
-def journal_history(request):
-    entries = MoodEntry.objects.filter(user=request.user).order_by('-date', '-time')
-    return render(request, 'core/journal_history.html', {'entries': entries})
+async def journal_history(request):
+    user = await _auser(request)
+    page = await akeyset_page(MoodEntry.objects.filter(user=user), ['date', 'time', 'id'], request.GET.get('cursor'))
+    return render(request, 'core/journal_history.html', {'entries': page.items, 'page': page})
 
 
 @login_required
@@ -317,6 +376,24 @@ def journal_delete(request, pk):
 
 
 
+@login_required
+def export_data(request):
+    dataset = request.GET.get('dataset', 'all')
+    fmt = request.GET.get('format', 'ndjson')
+    gzip = request.GET.get('gzip') == '1'
+
+    stream = aexport_stream if isinstance(request, ASGIRequest) else export_stream
+    try:
+        chunks = stream(request.user, dataset, fmt, gzip)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    content_type = 'application/gzip' if gzip else ('text/csv' if fmt == 'csv' else 'application/x-ndjson')
+    response = StreamingHttpResponse(chunks, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{export_filename(request.user, dataset, fmt, gzip)}"'
+    return response
+
+
 @login_required
 def reward_create(request):
     if request.method == 'POST':
@@ -361,63 +438,80 @@ def reward_delete(request, pk):
 def reward_claim(request, pk):
     reward = get_object_or_404(Rewards, pk=pk, user=request.user)
 
-    if reward.is_claimed:
+    try:
+        claim_reward(request.user, reward)
+    except RewardAlreadyClaimed:
         messages.info(request, "You already claimed this reward.")
-    elif request.user.points >= reward.points:
-        request.user.points -= reward.points
-        request.user.save()
-
-        reward.is_claimed = True
-
-        reward.claimed_at = timezone.now()
-        reward.save()
-
-        messages.success(request, "ENJOY")
-    else:
+    except InsufficientPoints:
         messages.error(request, "Not enough points to claim this reward.")
+    else:
+        messages.success(request, "ENJOY")
 
     return redirect('reward_list')
 
 
+SUMMARY_UNAVAILABLE = "Your AI assistant is taking a short coffee break. Please try generating your summary again in a moment!"
+
+
 @login_required
-def daily_summary_ai(request):
-    user = request.user
+async def daily_summary_ai(request):
+    user = await _auser(request)
     today = timezone.localdate()
 
-    existing = AISummary.objects.filter(user=user, date=today).first()
-    if existing:
+    existing = await AISummary.objects.filter(user=user, date=today).afirst()
+    if existing and existing.fingerprint == await sync_to_async(current_fingerprint)(user.pk, today):
         return render(request, 'core/daily_summary.html', {'ai_summary': existing.content})
 
-    tasks_today = Task.objects.filter(user=user, due_date__date=today)
-    completed = tasks_today.filter(status='completed')
-    pending = tasks_today.exclude(status='completed')
-    pomodoros = PomodoroSession.objects.filter(user=user, start_time__date=today).count()
-    mood_entry = MoodEntry.objects.filter(user=user, date=today).first()
-
-    prompt = f"""
-    The user's name is {user.username}. [Tutaj reszta Twojego promptu...]
-    """
-
-    try:
-        client = OpenAI(api_key=settings.OPENAI_API_KEY)
-
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are the best, caring, supportive coach."},
-                {"role": "user", "content": prompt}
-            ]
-        )
-        ai_summary = response.choices[0].message.content
+    # The page streams a new summary from daily_summary_stream, showing the
+    # outdated one (if any) until the first words arrive.
+    return render(request, 'core/daily_summary.html', {
+        'pending': True,
+        'ai_summary': existing.content if existing else '',
+        'unavailable_message': SUMMARY_UNAVAILABLE,
+    })
 
-        AISummary.objects.create(user=user, date=today, content=ai_summary)
 
-        return render(request, 'core/daily_summary.html', {'ai_summary': ai_summary})
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
 
-    except Exception as e:
-        print(f"Error OpenAI: {e}")
 
-        messages.error(request,
-                       "Your AI assistant is taking a short coffee break. Please try generating your summary again in a moment!")
-        return redirect('dashboard')
+@login_required
+def daily_summary_stream(request):
+    """Server-sent events: ``token`` events carry the summary as the LLM
+    writes it, then ``done`` or ``error`` ends the stream.
 
+    Under ASGI the events come from an async generator; under WSGI from a
+    plain one on the shared blocking client, so each chunk still goes out
+    as it arrives instead of the response being buffered whole.
+    """
+    user_id = request.user.pk
+    today = timezone.localdate()
+    client = get_llm_client()
+
+    def events():
+        # Sent at once, so the browser gets its first byte before the LLM
+        # answers; also stops EventSource from reconnecting eagerly.
+        yield 'retry: 30000\n\n'
+        try:
+            for chunk in stream_summary(user_id, today, client):
+                yield _sse('token', chunk)
+        except LLMError:
+            yield _sse('error', SUMMARY_UNAVAILABLE)
+        else:
+            yield _sse('done', '')
+
+    async def aevents():
+        yield 'retry: 30000\n\n'
+        try:
+            async for chunk in astream_summary(user_id, today, client):
+                yield _sse('token', chunk)
+        except LLMError:
+            yield _sse('error', SUMMARY_UNAVAILABLE)
+        else:
+            yield _sse('done', '')
+
+    stream = aevents() if isinstance(request, ASGIRequest) else events()
+    response = StreamingHttpResponse(stream, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
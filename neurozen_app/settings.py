@@ -46,6 +46,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -57,6 +58,29 @@ MIDDLEWARE = [
 
 AUTH_USER_MODEL = 'core.User'
 
+AUTHENTICATION_BACKENDS = ['core.backends.CachedModelBackend']
+
+# File-based by default so every worker process on the host sees the same
+# entries (and invalidations). Point CACHE_BACKEND/CACHE_LOCATION at a
+# shared backend such as django.core.cache.backends.redis.RedisCache when
+# running on more than one host, or with more than a few thousand active
+# users: the file cache counts its files on every write.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', str(BASE_DIR / '.cache')),
+        'TIMEOUT': 300,
+    }
+}
+# Sessions, cached users, version keys, dashboard snapshots and summary
+# completions share this cache, about ten entries per active user; Django's
+# default of 300 entries would cull (sessions and version keys included)
+# on nearly every write. Redis and Memcached evict by memory instead.
+if CACHES['default']['BACKEND'].endswith(('FileBasedCache', 'LocMemCache')):
+    CACHES['default']['OPTIONS'] = {'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', 50000))}
+
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
 ROOT_URLCONF = 'neurozen_app.urls'
 
 TEMPLATES = [
@@ -130,6 +154,25 @@ STATIC_URL = '/static/'
 
 STATICFILES_DIRS = [ BASE_DIR / "static" ]
 
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# collectstatic writes .gz/.br copies of the assets. With STATIC_MANIFEST on
+# it also writes content-hashed names that templates then reference, so they
+# can be cached forever; that needs a collectstatic run before the app
+# starts, so it is opt-in (tests and fresh checkouts have no manifest).
+STATIC_MANIFEST = os.getenv('STATIC_MANIFEST', 'False') == 'True'
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {
+        'BACKEND': 'core.assets.CompressedManifestStaticFilesStorage' if STATIC_MANIFEST
+        else 'core.assets.CompressedStaticFilesStorage',
+    },
+}
+
+# Serve STATIC_ROOT from the app itself (with immutable cache headers) when
+# there is no web server or CDN in front of it.
+SERVE_STATIC = os.getenv('SERVE_STATIC', 'True') == 'True'
+
 LOGOUT_REDIRECT_URL = '/'
 
 # Default primary key field type
@@ -139,7 +182,37 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 
-EMAIL_BACKEND = os.getenv('EMAIL_BACKEND')
+# Dotted path of the LLM client that writes the daily summaries. Set it to
+# 'core.llm.StubClient' to develop without calling OpenAI.
+LLM_CLIENT = os.getenv('LLM_CLIENT', 'core.llm.OpenAIClient')
+LLM_MODEL = os.getenv('LLM_MODEL', 'gpt-3.5-turbo')
+# Any OpenAI-compatible endpoint, e.g. the local fake server started with
+# `manage.py run_fake_llm_server` (http://127.0.0.1:8765/v1).
+LLM_BASE_URL = os.getenv('LLM_BASE_URL') or None
+# Per-request timeouts in seconds and retries of the OpenAI client. After
+# LLM_BREAKER_FAILURES consecutive failures, calls fail fast for
+# LLM_BREAKER_RESET seconds.
+LLM_CONNECT_TIMEOUT = float(os.getenv('LLM_CONNECT_TIMEOUT', 5))
+LLM_TIMEOUT = float(os.getenv('LLM_TIMEOUT', 30))
+LLM_MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES', 1))
+LLM_BREAKER_FAILURES = int(os.getenv('LLM_BREAKER_FAILURES', 5))
+LLM_BREAKER_RESET = float(os.getenv('LLM_BREAKER_RESET', 30))
+# Approximate token budget of the day context in the summary prompt, and how
+# long (in seconds) completions are cached for identical prompts.
+LLM_PROMPT_TOKENS = int(os.getenv('LLM_PROMPT_TOKENS', 600))
+LLM_CACHE_TIMEOUT = int(os.getenv('LLM_CACHE_TIMEOUT', 7 * 24 * 3600))
+
+# /metrics is served to clients presenting METRICS_TOKEN as a bearer token,
+# or, when no token is set, to requests from METRICS_ALLOWED_IPS.
+METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+METRICS_ALLOWED_IPS = os.getenv('METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(',')
+METRICS_SERVER_TIMING = os.getenv('METRICS_SERVER_TIMING', 'False') == 'True'
+
+# Read per-category task status counts from the denormalized counters on
+# Category instead of counting tasks on every page view.
+CATEGORY_TASK_COUNTERS = os.getenv('CATEGORY_TASK_COUNTERS', 'False') == 'True'
+
+EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
 EMAIL_HOST = os.getenv('EMAIL_HOST')
 EMAIL_PORT = int(os.getenv('EMAIL_PORT', 587))
 EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', 'True') == 'True'
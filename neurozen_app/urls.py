@@ -1,6 +1,9 @@
+import re
+
+from django.conf import settings
 from django.contrib import admin
-from django.urls import path
-from core import views
+from django.urls import path, re_path
+from core import views, api, assets
 from django.urls import reverse_lazy
 from django.contrib.auth.views import PasswordChangeView, PasswordResetView, PasswordResetDoneView, PasswordResetConfirmView, PasswordResetCompleteView
 
@@ -9,12 +12,19 @@ app_name = 'core'
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics', views.metrics, name='metrics'),
+    path('api/v1/dashboard/', api.dashboard, name='api_dashboard'),
+    path('api/v1/insights/', api.insights, name='api_insights'),
+    path('api/v1/search/', api.search, name='api_search'),
+    path('api/v1/<slug:resource_name>/', api.collection, name='api_collection'),
+    path('api/v1/<slug:resource_name>/<int:pk>/', api.detail, name='api_detail'),
     path('', views.home, name='home'),
     path('register/', views.register, name='register'),
     path('dashboard/', views.dashboard, name='dashboard'),
     path('login/', views.login_view, name='login'),
     path('logout/', views.logout_view, name='logout'),
     path('tasks/create/', views.task_create, name='task_create'),
+    path('tasks/import/', views.task_import, name='task_import'),
     path('tasks/<int:pk>/edit/', views.task_edit, name='task_edit'),
     path('tasks/<int:pk>/delete/', views.task_delete, name='task_delete'),
     path('tasks/categories/', views.task_categories, name='task_categories'),
@@ -34,7 +44,9 @@ urlpatterns = [
     path('rewards/<int:pk>/delete/', views.reward_delete, name='reward_delete'),
     path('rewards/<int:pk>/claim/', views.reward_claim, name='reward_claim'),
     path('summary/', views.daily_summary_ai, name='daily_summary'),
+    path('summary/stream/', views.daily_summary_stream, name='daily_summary_stream'),
     path('settings/', views.user_settings, name='user_settings'),
+    path('settings/export/', views.export_data, name='export_data'),
     path('settings/password/', PasswordChangeView.as_view(template_name='core/password_change.html',
         success_url=reverse_lazy('user_settings')),
          name='password_change'),
@@ -43,3 +55,8 @@ urlpatterns = [
     path('reset/<uidb64>/<token>/', PasswordResetConfirmView.as_view(template_name='core/password_reset_confirm.html'), name='password_reset_confirm'),
     path('reset/done/', PasswordResetCompleteView.as_view(template_name='core/password_reset_complete.html'), name='password_reset_complete'),
 ]
+
+if settings.SERVE_STATIC:
+    urlpatterns += [
+        re_path(r'^%s(?P<path>.*)$' % re.escape(settings.STATIC_URL.lstrip('/')), assets.serve_asset, name='static_asset'),
+    ]